@@ -18,15 +18,9 @@ def build_parser() -> argparse.ArgumentParser:
     return p
 
 
-def main(argv: Optional[List[str]] = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
-    text = args.text or ""
-    if len(text.strip()) == 0:
-        print("Error: --text must be non-empty.")
-        return 2
-
+def _run(args: argparse.Namespace) -> dict:
+    """Synthesize per parsed args (text already validated) and return the metadata."""
+    text = args.text
     tts = LocalTTS()
 
     if args.output:
@@ -40,21 +34,35 @@ def main(argv: Optional[List[str]] = None) -> int:
         res = tts.synthesize(text, sample_rate=args.sample_rate, amplitude=args.amplitude)
         output_path = None
 
+    meta = {
+        "text": text,
+        "sample_rate": res.sample_rate,
+        "duration_s": res.duration_s,
+        "bytes": len(res.pcm16),
+    }
+    if output_path:
+        meta["output"] = output_path
+    return meta
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    text = args.text or ""
+    if len(text.strip()) == 0:
+        print("Error: --text must be non-empty.")
+        return 2
+
+    meta = _run(args)
+
     if args.json:
-        meta = {
-            "text": text,
-            "sample_rate": res.sample_rate,
-            "duration_s": res.duration_s,
-            "bytes": len(res.pcm16),
-        }
-        if output_path:
-            meta["output"] = output_path
         print(json.dumps(meta))
     else:
-        if output_path:
-            print(f"WAV written: {output_path}")
+        if "output" in meta:
+            print(f"WAV written: {meta['output']}")
         else:
-            print(f"Synthesized {len(res.pcm16)} bytes @ {res.sample_rate} Hz, {res.duration_s}s")
+            print(f"Synthesized {meta['bytes']} bytes @ {meta['sample_rate']} Hz, {meta['duration_s']}s")
 
     return 0
 
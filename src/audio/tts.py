@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import io
+import sys
 import math
-import wave
 import struct
+import array
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterator, Optional
 
 
@@ -66,8 +68,6 @@ class LocalTTS(SpeechSynthesizer):
         char_samples = max(1, int(sr * self.char_ms / 1000.0))
         gap_samples = max(1, int(sr * self.gap_ms / 1000.0))
 
-        frames: list[int] = []
-
         def tone_freq(ch: str) -> float:
             # Map ASCII letters/digits to a small set of tones; others default.
             # Use a simple hash to keep deterministic mapping.
@@ -76,56 +76,64 @@ class LocalTTS(SpeechSynthesizer):
             idx = (ord(ch) % 12)
             return base + step * idx
 
-        def append_silence(n: int):
-            frames.extend([0] * n)
-
-        def append_tone(freq: float, n: int):
-            # Simple sine wave
-            two_pi_f = 2.0 * math.pi * freq
-            for i in range(n):
-                t = i / sr
-                s = math.sin(two_pi_f * t)
-                val = int(max(-1.0, min(1.0, s)) * (amp * 32767))
-                frames.append(val)
-
-        # Build frames
+        # Cached tone per character, joined by cached gaps
         effective_chars = [c for c in input_text if not c.isspace()]
         if not effective_chars:
-            append_silence(int(0.2 * sr))  # 200 ms silence
+            pcm16 = _silence_pcm16(int(0.2 * sr))  # 200 ms silence
         else:
-            for idx, ch in enumerate(effective_chars):
-                append_tone(tone_freq(ch), char_samples)
-                if idx != len(effective_chars) - 1:
-                    append_silence(gap_samples)
-
-        # Pack to PCM16LE
-        pcm16 = _int16_list_to_pcm16(frames)
-        duration = len(frames) / float(sr)
+            pcm16 = _silence_pcm16(gap_samples).join(
+                [_tone_pcm16(tone_freq(ch), char_samples, sr, amp) for ch in effective_chars]
+            )
+        duration = (len(pcm16) // 2) / float(sr)
         return SynthesisResult(pcm16=pcm16, sample_rate=sr, duration_s=round(duration, 3))
 
     def stream(self, text: str, chunk_ms: int = 20, sample_rate: int = 16000, amplitude: float = 0.2) -> Iterator[bytes]:
         res = self.synthesize(text, sample_rate=sample_rate, amplitude=amplitude)
         sr = res.sample_rate
         chunk_samples = max(1, int(sr * chunk_ms / 1000.0))
-        # Iterate over the PCM16 in sample-sized chunks
-        total_samples = len(res.pcm16) // 2
-        for start in range(0, total_samples, chunk_samples):
-            end = min(total_samples, start + chunk_samples)
-            yield res.pcm16[start * 2 : end * 2]
+        # Slice a view of the PCM16 buffer; copy only the bytes yielded
+        mv = memoryview(res.pcm16)
+        total_bytes = (len(mv) // 2) * 2
+        chunk_bytes = chunk_samples * 2
+        for start in range(0, total_bytes, chunk_bytes):
+            yield bytes(mv[start : min(total_bytes, start + chunk_bytes)])
 
 
 # --- Helpers ---
 
-def _int16_list_to_pcm16(values: list[int]) -> bytes:
-    if not values:
-        return b""
-    fmt = f"<{len(values)}h"
-    return struct.pack(fmt, *values)
+@lru_cache(maxsize=256)
+def _tone_pcm16(freq: float, n: int, sample_rate: int, amp: float) -> bytes:
+    # Simple sine wave of n samples; blocks are immutable, so repeated
+    # characters (and repeated calls) share one buffer
+    two_pi_f = 2.0 * math.pi * freq
+    scale = amp * 32767
+    sin = math.sin
+    return _int16_to_pcm16(
+        [int(max(-1.0, min(1.0, sin(two_pi_f * (i / sample_rate)))) * scale) for i in range(n)]
+    )
+
+
+@lru_cache(maxsize=32)
+def _silence_pcm16(n: int) -> bytes:
+    return bytes(2 * n)
+
+
+def _int16_to_pcm16(values: list[int]) -> bytes:
+    # One C-level copy through array('h') instead of struct-packing *values
+    pcm = array.array("h", values)
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
 
 
 def _write_wav_mono_pcm16(path: str, sample_rate: int, pcm16: bytes) -> None:
-    with wave.open(path, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(pcm16)
+    # Canonical 44-byte RIFF/WAVE header for mono PCM16, then the data in one write
+    data_len = len(pcm16)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_len, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, 2 * sample_rate, 2, 16,
+        b"data", data_len,
+    )
+    with open(path, "wb") as f:
+        f.write(header + pcm16)
@@ -17,6 +17,7 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from math import floor
 from typing import Any, Dict, Optional
 
@@ -34,11 +35,25 @@ class VRAMBudget:
     safety_margin: float = 0.10
 
     def effective_gb(self) -> float:
-        if self.vram_cap_gb <= 0:
-            raise ValueError("vram_cap_gb must be > 0")
-        if not (0.0 <= self.safety_margin < 1.0):
-            raise ValueError("safety_margin must be in [0.0, 1.0)")
-        return self.vram_cap_gb * (1.0 - self.safety_margin)
+        return _effective_budget_gb(self.vram_cap_gb, self.safety_margin)
+
+
+@lru_cache(maxsize=128)
+def _effective_budget_gb(vram_cap_gb: float, safety_margin: float) -> float:
+    if vram_cap_gb <= 0:
+        raise ValueError("vram_cap_gb must be > 0")
+    if not (0.0 <= safety_margin < 1.0):
+        raise ValueError("safety_margin must be in [0.0, 1.0)")
+    return vram_cap_gb * (1.0 - safety_margin)
+
+
+@lru_cache(maxsize=128)
+def _suggest_batch_size(effective_gb: float, overhead_gb: float, per_sample_gb: float) -> int:
+    """Largest batch fitting after overhead, or 0 if not even one sample fits."""
+    usable = effective_gb - overhead_gb
+    if usable < per_sample_gb:
+        return 0
+    return max(int(floor(usable / per_sample_gb)), 0)
 
 
 class ModelAdapter(ABC):
@@ -80,8 +95,8 @@ class ModelAdapter(ABC):
         per_sample = self.estimate_sample_mem_gb(input_spec)
         if per_sample <= 0 or overhead < 0:
             raise ValueError("per-sample must be > 0 and overhead >= 0")
-        usable = eff - overhead
-        if usable < per_sample:
+        size = _suggest_batch_size(eff, overhead, per_sample)
+        if size == 0:
             logger.debug(
                 "Batch suggest: unusable budget (eff=%.3f, overhead=%.3f, per=%.3f)",
                 eff,
@@ -89,7 +104,6 @@ class ModelAdapter(ABC):
                 per_sample,
             )
             return 0
-        size = int(floor(usable / per_sample))
         logger.debug(
             "Batch suggest: eff=%.3f, overhead=%.3f, per=%.3f => batch=%d",
             eff,
@@ -97,7 +111,7 @@ class ModelAdapter(ABC):
             per_sample,
             size,
         )
-        return max(size, 0)
+        return size
 
     def can_fit_batch(
         self,
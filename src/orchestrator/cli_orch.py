@@ -2,7 +2,7 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Allow running as module: python -m orchestrator.cli_orch
 try:
@@ -44,6 +44,31 @@ def _load_plan(path: str) -> List[Job]:
     return jobs
 
 
+def run_actions(
+    actions: List[str],
+    *,
+    concurrency: int = 4,
+    rate: Optional[float] = None,
+    stop_on_error: bool = False,
+) -> Dict[str, Any]:
+    """Run inline action strings and return the scheduler summary.
+
+    Programmatic equivalent of ``--actions ...`` without argv parsing.
+    """
+    concurrency = max(1, int(concurrency))
+    return _run_jobs(parse_actions(actions, concurrency=concurrency), concurrency, rate, stop_on_error)
+
+
+def _run_jobs(jobs: List[Job], concurrency: int, rate: Optional[float], stop_on_error: bool) -> Dict[str, Any]:
+    sched = Scheduler(
+        jobs,
+        concurrency=concurrency,
+        rate_limit_per_sec=rate,
+        stop_on_error=stop_on_error,
+    )
+    return sched.run()
+
+
 def main(argv=None) -> int:
     argv = sys.argv[1:] if argv is None else argv
     parser = _build_parser()
@@ -55,7 +80,7 @@ def main(argv=None) -> int:
     stop_on_error = bool(args.stop_on_error)
 
     if args.plan:
-        jobs = _load_plan(args.plan)
+        summary: Dict[str, Any] = _run_jobs(_load_plan(args.plan), concurrency, rate, stop_on_error)
     else:
         remainder = args.actions or []
         # Parse flags that may appear in the remainder, updating our local settings
@@ -95,15 +120,7 @@ def main(argv=None) -> int:
         if not actions:
             parser.error("No actions provided after --actions")
             return 2
-        jobs = parse_actions(actions, concurrency=concurrency)
-
-    sched = Scheduler(
-        jobs,
-        concurrency=concurrency,
-        rate_limit_per_sec=rate,
-        stop_on_error=stop_on_error,
-    )
-    summary: Dict[str, Any] = sched.run()
+        summary = run_actions(actions, concurrency=concurrency, rate=rate, stop_on_error=stop_on_error)
 
     if json_out:
         sys.stdout.write(json.dumps(summary))
@@ -40,6 +40,11 @@ class Job:
     result: Any = None
 
 
+def _noop_result(job: Job) -> Any:
+    t = job.task
+    return t.args.get("value", t.name or job.id)
+
+
 class Scheduler:
     def __init__(
         self,
@@ -49,6 +54,8 @@ class Scheduler:
         max_workers: Optional[int] = None,
         rate_limit_per_sec: Optional[float] = None,
         stop_on_error: bool = False,
+        fast_noop: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
     ) -> None:
         if concurrency <= 0:
             raise ValueError("concurrency must be positive")
@@ -59,12 +66,18 @@ class Scheduler:
         self.max_workers = min(16, max_workers if isinstance(max_workers, int) and max_workers > 0 else os.cpu_count() or 2)
         self.rate_limit_per_sec = rate_limit_per_sec
         self.stop_on_error = stop_on_error
+        # Run ready noop jobs (no timeout) inline instead of spawning a task each
+        self.fast_noop = fast_noop
         self._current_concurrency = 0
         self._peak_concurrency = 0
         self._cc_lock = asyncio.Lock()
         self.logs: List[Dict[str, Any]] = []
         self._cancelled = False
-        self._start_time = time.perf_counter()
+        # Monotonic seconds source for timestamps, logs and rate limiting
+        self._clock = clock
+        # Dispatch counters reported in summary["stats"]
+        self._stats: Dict[str, int] = {"tasks_created": 0, "inline_jobs": 0}
+        self._start_time = clock()
         self._rate_bucket: List[float] = []  # timestamps of job starts (seconds)
 
         # Build DAG structures
@@ -104,7 +117,7 @@ class Scheduler:
             raise ValueError("cycle detected in DAG")
 
     def _log(self, event: str, job: Optional[Job] = None, **extra: Any) -> None:
-        ts = time.perf_counter() - self._start_time
+        ts = self._clock() - self._start_time
         rec = {"ts": round(ts, 6), "event": event}
         if job is not None:
             rec["job"] = job.id
@@ -129,7 +142,7 @@ class Scheduler:
     async def _respect_rate_limit(self) -> None:
         if not self.rate_limit_per_sec or self.rate_limit_per_sec <= 0:
             return
-        now = time.perf_counter()
+        now = self._clock()
         window = 1.0
         # prune
         self._rate_bucket = [t for t in self._rate_bucket if now - t < window]
@@ -140,12 +153,12 @@ class Scheduler:
             if sleep_for > 0:
                 await asyncio.sleep(sleep_for)
         # record
-        self._rate_bucket.append(time.perf_counter())
+        self._rate_bucket.append(self._clock())
 
     async def _run_task(self, job: Job) -> Any:
         t = job.task
         if t.type == "noop":
-            return t.args.get("value", t.name or job.id)
+            return _noop_result(job)
         elif t.type == "sleep":
             seconds = float(t.args.get("seconds", t.args.get("s", 0)))
             await asyncio.sleep(seconds)
@@ -180,7 +193,7 @@ class Scheduler:
         await self._respect_rate_limit()
         await self._inc_concurrency()
         job.status = "running"
-        job.started_at = time.perf_counter() - self._start_time
+        job.started_at = self._clock() - self._start_time
         self._log("job_started", job)
         try:
             attempt = 0
@@ -214,12 +227,46 @@ class Scheduler:
                 else:
                     break
         finally:
-            job.ended_at = time.perf_counter() - self._start_time
+            job.ended_at = self._clock() - self._start_time
             self._log("job_finished", job)
             await self._dec_concurrency()
             sem.release()
 
         completed.add(jid)
+        self._release_children(jid, ready_queue, completed)
+
+    def _run_noop_sync(self, jid: str, ready_queue: asyncio.Queue[str], completed: Set[str]) -> None:
+        """Complete a ready noop job without awaiting anything.
+
+        Equivalent to _execute_job for a zero-work job when no rate limit is set:
+        nothing in between can yield, so the semaphore and concurrency lock are
+        not needed, and consecutive ready noops drain in one pass of the loop.
+        """
+        job = self.jobs_by_id[jid]
+        if job.status not in ("pending",):
+            return
+        self._current_concurrency += 1
+        if self._current_concurrency > self._peak_concurrency:
+            self._peak_concurrency = self._current_concurrency
+        job.status = "running"
+        job.started_at = self._clock() - self._start_time
+        self._log("job_started", job)
+        job.attempts = 1
+        try:
+            job.result = _noop_result(job)
+            job.status = "succeeded"
+        except Exception as e:
+            # e.g. plan JSON with "args": null; same outcome as _execute_job
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.ended_at = self._clock() - self._start_time
+            self._log("job_finished", job)
+            self._current_concurrency -= 1
+        completed.add(jid)
+        self._release_children(jid, ready_queue, completed)
+
+    def _release_children(self, jid: str, ready_queue: asyncio.Queue[str], completed: Set[str]) -> None:
         # enqueue children whose all deps completed successfully
         for child in self._children[jid]:
             cjob = self.jobs_by_id[child]
@@ -229,8 +276,8 @@ class Scheduler:
             dep_statuses = [self.jobs_by_id[d].status for d in cjob.deps]
             if any(s in ("failed", "timeout", "cancelled", "skipped") for s in dep_statuses):
                 cjob.status = "skipped"
-                cjob.started_at = cjob.started_at or (time.perf_counter() - self._start_time)
-                cjob.ended_at = cjob.ended_at or (time.perf_counter() - self._start_time)
+                cjob.started_at = cjob.started_at or (self._clock() - self._start_time)
+                cjob.ended_at = cjob.ended_at or (self._clock() - self._start_time)
                 self._log("job_skipped", cjob, reason="dependency_failed")
                 # Still mark as completed for DAG progression; children will inspect too
                 completed.add(child)
@@ -238,7 +285,38 @@ class Scheduler:
             else:
                 # check if all deps are completed (succeeded or skipped)
                 if all(d in completed for d in cjob.deps):
-                    await ready_queue.put(child)
+                    ready_queue.put_nowait(child)
+
+    async def _cancel_on_error(self, tasks: Dict[str, "asyncio.Task[None]"]) -> bool:
+        """With stop_on_error, cancel everything once any job failed or timed out.
+
+        Returns True when the run was cancelled by this call.
+        """
+        if not self.stop_on_error or self._cancelled:
+            return False
+        any_failed = any(j.status in ("failed", "timeout") for j in self.jobs_by_id.values())
+        if not any_failed:
+            return False
+        self._cancelled = True
+        self._log("scheduler_cancelling", reason="stop_on_error")
+        # Cancel active tasks
+        for t in tasks.values():
+            t.cancel()
+        # Give tasks a chance to handle cancellation and update job states
+        if tasks:
+            try:
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+            except Exception:
+                pass
+        # Mark any not yet started as cancelled
+        for jid, job in self.jobs_by_id.items():
+            if job.status == "pending":
+                job.status = "cancelled"
+                job.started_at = job.started_at or (self._clock() - self._start_time)
+                job.ended_at = job.ended_at or (self._clock() - self._start_time)
+                self._log("job_cancelled", job, reason="stop_on_error")
+        tasks.clear()
+        return True
 
     async def run_async(self) -> Dict[str, Any]:
         sem = asyncio.Semaphore(self.concurrency)
@@ -257,14 +335,33 @@ class Scheduler:
             while not ready_queue.empty() or tasks:
                 # launch while capacity and ready jobs exist
                 while not ready_queue.empty() and len(tasks) < self.concurrency and not self._cancelled:
-                    jid = await ready_queue.get()
+                    jid = ready_queue.get_nowait()
                     job = self.jobs_by_id[jid]
                     if self._cancelled:
                         job.status = "cancelled"
                         self._log("job_cancelled", job, reason="scheduler_cancelled")
                         completed.add(jid)
                         continue
+                    if self.fast_noop and job.task.type == "noop" and not job.task.timeout and not job.task.max_retries:
+                        # Zero-work job: a free slot exists (len(tasks) < concurrency),
+                        # so execute it here; children land in ready_queue directly.
+                        # Jobs with retries keep the task path for its backoff sleeps.
+                        if self.rate_limit_per_sec:
+                            await self._execute_job(jid, sem, ready_queue, completed)
+                        else:
+                            self._run_noop_sync(jid, ready_queue, completed)
+                        self._stats["inline_jobs"] += 1
+                        if self.stop_on_error and (tasks or job.status == "failed"):
+                            # Inline completions never reach the wait below, so check
+                            # here too; first let in-flight tasks step so their
+                            # failures are visible, as they would be after a wait
+                            if tasks:
+                                await asyncio.sleep(0)
+                            if await self._cancel_on_error(tasks):
+                                break
+                        continue
                     t = asyncio.create_task(self._execute_job(jid, sem, ready_queue, completed))
+                    self._stats["tasks_created"] += 1
                     tasks[jid] = t
 
                 if not tasks:
@@ -281,29 +378,8 @@ class Scheduler:
                     tasks.pop(jid, None)
 
                 # If stop_on_error, cancel remaining pending jobs and mark cancelled
-                if self.stop_on_error and not self._cancelled:
-                    any_failed = any(j.status in ("failed", "timeout") for j in self.jobs_by_id.values())
-                    if any_failed:
-                        self._cancelled = True
-                        self._log("scheduler_cancelling", reason="stop_on_error")
-                        # Cancel active tasks
-                        for t in tasks.values():
-                            t.cancel()
-                        # Give tasks a chance to handle cancellation and update job states
-                        if tasks:
-                            try:
-                                await asyncio.gather(*tasks.values(), return_exceptions=True)
-                            except Exception:
-                                pass
-                        # Mark any not yet started as cancelled
-                        for jid, job in self.jobs_by_id.items():
-                            if job.status == "pending":
-                                job.status = "cancelled"
-                                job.started_at = job.started_at or (time.perf_counter() - self._start_time)
-                                job.ended_at = job.ended_at or (time.perf_counter() - self._start_time)
-                                self._log("job_cancelled", job, reason="stop_on_error")
-                        tasks.clear()
-                        break
+                if await self._cancel_on_error(tasks):
+                    break
         finally:
             if self._process_pool is not None:
                 self._process_pool.shutdown(cancel_futures=True)
@@ -324,6 +400,7 @@ class Scheduler:
                 for jid, j in self.jobs_by_id.items()
             },
             "logs": self.logs,
+            "stats": dict(self._stats),
         }
         return summary
 
@@ -48,10 +48,18 @@ def _get_input_bytes(args: argparse.Namespace) -> bytes:
     raise SystemExit(2)
 
 
-def main(argv: Optional[List[str]] = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+class _CLIError(Exception):
+    """A failure reported to the user: exit code plus JSON and plain-text messages."""
 
+    def __init__(self, rc: int, error: str, text: Optional[str] = None):
+        super().__init__(error)
+        self.rc = rc
+        self.error = error
+        self.text = error if text is None else text
+
+
+def _run(args: argparse.Namespace) -> dict:
+    """Carry out one parsed command and return its result dict; raises _CLIError."""
     mode = args.mode
     op = args.op
 
@@ -61,114 +69,92 @@ def main(argv: Optional[List[str]] = None) -> int:
             if args.key:
                 key = _bhex(args.key)
                 if len(key) != 32:
-                    print(json.dumps({"error": "AES key must be 32 bytes (hex length 64)"}) if args.json else "Error: AES key must be 32 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "AES key must be 32 bytes (hex length 64)", "AES key must be 32 bytes")
                 iv = _bhex(args.iv) if args.iv else b""
                 if len(iv) != 16:
-                    print(json.dumps({"error": "IV must be 16 bytes"}) if args.json else "Error: IV must be 16 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "IV must be 16 bytes")
                 aes = AES256CBC(key)
                 ct = aes.encrypt_cbc(iv, pt)
             else:
                 if not (args.password and args.salt and args.iv):
-                    print(json.dumps({"error": "--password, --salt, and --iv are required for password mode"}) if args.json else "Error: missing --password/--salt/--iv", flush=True)
-                    return 2
+                    raise _CLIError(2, "--password, --salt, and --iv are required for password mode", "missing --password/--salt/--iv")
                 salt = _bhex(args.salt)
                 iv = _bhex(args.iv)
                 if len(iv) != 16:
-                    print(json.dumps({"error": "IV must be 16 bytes"}) if args.json else "Error: IV must be 16 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "IV must be 16 bytes")
                 ct = encrypt_with_password(pt, args.password, salt, iv, iterations=args.iterations)
-            out = {"mode": "aes", "op": "encrypt", "ciphertext": ct.hex()}
-            if args.json:
-                print(json.dumps(out))
-            else:
-                print(f"ciphertext={out['ciphertext']}")
-            return 0
+            return {"mode": "aes", "op": "encrypt", "ciphertext": ct.hex()}
         else:  # decrypt
             ct = _get_input_bytes(args)
             if args.key:
                 key = _bhex(args.key)
                 if len(key) != 32:
-                    print(json.dumps({"error": "AES key must be 32 bytes (hex length 64)"}) if args.json else "Error: AES key must be 32 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "AES key must be 32 bytes (hex length 64)", "AES key must be 32 bytes")
                 iv = _bhex(args.iv) if args.iv else b""
                 if len(iv) != 16:
-                    print(json.dumps({"error": "IV must be 16 bytes"}) if args.json else "Error: IV must be 16 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "IV must be 16 bytes")
                 aes = AES256CBC(key)
                 try:
                     pt = aes.decrypt_cbc(iv, ct)
                 except Exception as e:
-                    if args.json:
-                        print(json.dumps({"error": str(e)}))
-                    else:
-                        print(f"Error: {e}")
-                    return 1
+                    raise _CLIError(1, str(e)) from e
             else:
                 if not (args.password and args.salt and args.iv):
-                    print(json.dumps({"error": "--password, --salt, and --iv are required for password mode"}) if args.json else "Error: missing --password/--salt/--iv", flush=True)
-                    return 2
+                    raise _CLIError(2, "--password, --salt, and --iv are required for password mode", "missing --password/--salt/--iv")
                 salt = _bhex(args.salt)
                 iv = _bhex(args.iv)
                 if len(iv) != 16:
-                    print(json.dumps({"error": "IV must be 16 bytes"}) if args.json else "Error: IV must be 16 bytes", flush=True)
-                    return 2
+                    raise _CLIError(2, "IV must be 16 bytes")
                 try:
                     pt = decrypt_with_password(ct, args.password, salt, iv, iterations=args.iterations)
                 except Exception as e:
-                    if args.json:
-                        print(json.dumps({"error": str(e)}))
-                    else:
-                        print(f"Error: {e}")
-                    return 1
-            out = {"mode": "aes", "op": "decrypt", "plaintext": pt.decode("utf-8", errors="strict") if args.in_hex is not None else pt.decode("utf-8", errors="replace")}
-            if args.json:
-                print(json.dumps(out))
-            else:
-                print(f"plaintext={out['plaintext']}")
-            return 0
+                    raise _CLIError(1, str(e)) from e
+            return {"mode": "aes", "op": "decrypt", "plaintext": pt.decode("utf-8", errors="strict") if args.in_hex is not None else pt.decode("utf-8", errors="replace")}
 
     elif mode == "dpapi":
         data = _get_input_bytes(args)
         try:
             dp = DPAPIProtector(scope=args.scope)
         except NotImplementedError as e:
-            if args.json:
-                print(json.dumps({"error": str(e)}))
-            else:
-                print(f"Error: {e}")
-            return 2
+            raise _CLIError(2, str(e)) from e
         if op == "encrypt":
             blob = dp.protect(data)
-            out = {"mode": "dpapi", "op": "encrypt", "blob": blob.hex()}
-            if args.json:
-                print(json.dumps(out))
-            else:
-                print(f"blob={out['blob']}")
-            return 0
+            return {"mode": "dpapi", "op": "encrypt", "blob": blob.hex()}
         else:
             try:
                 pt = dp.unprotect(data)
             except Exception as e:
-                if args.json:
-                    print(json.dumps({"error": str(e)}))
-                else:
-                    print(f"Error: {e}")
-                return 1
-            out = {"mode": "dpapi", "op": "decrypt", "plaintext": pt.decode("utf-8", errors="replace")}
-            if args.json:
-                print(json.dumps(out))
-            else:
-                print(f"plaintext={out['plaintext']}")
-            return 0
+                raise _CLIError(1, str(e)) from e
+            return {"mode": "dpapi", "op": "decrypt", "plaintext": pt.decode("utf-8", errors="replace")}
 
     else:
-        if args.json:
-            print(json.dumps({"error": "unknown mode"}))
-        else:
-            print("Error: unknown mode")
-        return 2
+        raise _CLIError(2, "unknown mode")
+
+
+# Result field printed as key=value in plain-text output, per (mode, op)
+_TEXT_FIELD = {
+    ("aes", "encrypt"): "ciphertext",
+    ("aes", "decrypt"): "plaintext",
+    ("dpapi", "encrypt"): "blob",
+    ("dpapi", "decrypt"): "plaintext",
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        out = _run(args)
+    except _CLIError as e:
+        print(json.dumps({"error": e.error}) if args.json else f"Error: {e.text}", flush=True)
+        return e.rc
+    if args.json:
+        print(json.dumps(out))
+    else:
+        field = _TEXT_FIELD[(out["mode"], out["op"])]
+        print(f"{field}={out[field]}")
+    return 0
 
 
 if __name__ == "__main__":
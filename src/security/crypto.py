@@ -58,6 +58,55 @@ _RCON = [
 ]
 
 
+def _gf_mul(a: int, b: int) -> int:
+    # Multiplication in GF(2^8) modulo the AES polynomial
+    p = 0
+    for _ in range(8):
+        if b & 1:
+            p ^= a
+        hi = a & 0x80
+        a = (a << 1) & 0xFF
+        if hi:
+            a ^= 0x1B
+        b >>= 1
+    return p
+
+
+def _ror8(w: int) -> int:
+    return ((w >> 8) | (w << 24)) & 0xFFFFFFFF
+
+
+def _build_tables():
+    # T-tables fold SubBytes + MixColumns (Te) and InvSubBytes + InvMixColumns (Td)
+    # into one 32-bit lookup per state byte; Te1..3/Td1..3 are byte rotations.
+    te0 = []
+    td0 = []
+    for x in range(256):
+        s = _SBOX[x]
+        te0.append((_gf_mul(s, 2) << 24) | (s << 16) | (s << 8) | _gf_mul(s, 3))
+        v = _INV_SBOX[x]
+        td0.append((_gf_mul(v, 0x0E) << 24) | (_gf_mul(v, 0x09) << 16) | (_gf_mul(v, 0x0D) << 8) | _gf_mul(v, 0x0B))
+    te = [te0]
+    td = [td0]
+    for _ in range(3):
+        te.append([_ror8(w) for w in te[-1]])
+        td.append([_ror8(w) for w in td[-1]])
+    return tuple(tuple(t) for t in te), tuple(tuple(t) for t in td)
+
+
+(_TE0, _TE1, _TE2, _TE3), (_TD0, _TD1, _TD2, _TD3) = _build_tables()
+
+
+def _inv_mix_word(w: int) -> int:
+    # InvMixColumns of one column word, via Td[SBOX[b]] == InvMixColumns column of b
+    return (
+        _TD0[_SBOX[w >> 24]]
+        ^ _TD1[_SBOX[(w >> 16) & 0xFF]]
+        ^ _TD2[_SBOX[(w >> 8) & 0xFF]]
+        ^ _TD3[_SBOX[w & 0xFF]]
+    )
+
+
 def _sub_word(w: int) -> int:
     return (
         (_SBOX[(w >> 24) & 0xFF] << 24)
@@ -71,6 +120,11 @@ def _rot_word(w: int) -> int:
     return ((w << 8) & 0xFFFFFFFF) | ((w >> 24) & 0xFF)
 
 
+def _xor16(a: bytes, b: bytes) -> bytes:
+    # XOR two 16-byte blocks as one 128-bit integer instead of byte by byte
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(16, "little")
+
+
 @dataclass
 class AES256CBC:
     key: bytes
@@ -81,6 +135,14 @@ class AES256CBC:
         if len(self.key) != 32:
             raise ValueError("AES-256 requires 32-byte key")
         self._round_keys = self._expand_key(self.key)
+        # Round keys as 60 column words for the T-table rounds; the decryption
+        # schedule has InvMixColumns applied to rounds 1..13 (equivalent inverse cipher)
+        ek = [int.from_bytes(rk[i:i + 4], "big") for rk in self._round_keys for i in (0, 4, 8, 12)]
+        dk = list(ek)
+        for i in range(4, 56):
+            dk[i] = _inv_mix_word(ek[i])
+        self._ek = tuple(ek)
+        self._dk = tuple(dk)
 
     # Key expansion for AES-256 to generate 15 round keys (0..14), each 16 bytes
     @staticmethod
@@ -161,16 +223,7 @@ class AES256CBC:
 
     @staticmethod
     def _mul(a: int, b: int) -> int:
-        p = 0
-        for _ in range(8):
-            if b & 1:
-                p ^= a
-            hi = a & 0x80
-            a = (a << 1) & 0xFF
-            if hi:
-                a ^= 0x1B
-            b >>= 1
-        return p
+        return _gf_mul(a, b)
 
     @classmethod
     def _inv_mix_columns(cls, state: bytearray):
@@ -193,6 +246,31 @@ class AES256CBC:
             )
 
     def encrypt_block(self, block: bytes) -> bytes:
+        if len(block) != 16:
+            raise ValueError("block must be 16 bytes")
+        te0, te1, te2, te3, sbox = _TE0, _TE1, _TE2, _TE3, _SBOX
+        ek = self._ek
+        x = int.from_bytes(block, "big")
+        s0 = (x >> 96) ^ ek[0]
+        s1 = ((x >> 64) & 0xFFFFFFFF) ^ ek[1]
+        s2 = ((x >> 32) & 0xFFFFFFFF) ^ ek[2]
+        s3 = (x & 0xFFFFFFFF) ^ ek[3]
+        for k in range(4, 56, 4):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ ek[k],
+                te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ ek[k + 1],
+                te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ ek[k + 2],
+                te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ ek[k + 3],
+            )
+        # final round: SubBytes + ShiftRows + AddRoundKey (no MixColumns)
+        w0 = (sbox[s0 >> 24] << 24 | sbox[(s1 >> 16) & 0xFF] << 16 | sbox[(s2 >> 8) & 0xFF] << 8 | sbox[s3 & 0xFF]) ^ ek[56]
+        w1 = (sbox[s1 >> 24] << 24 | sbox[(s2 >> 16) & 0xFF] << 16 | sbox[(s3 >> 8) & 0xFF] << 8 | sbox[s0 & 0xFF]) ^ ek[57]
+        w2 = (sbox[s2 >> 24] << 24 | sbox[(s3 >> 16) & 0xFF] << 16 | sbox[(s0 >> 8) & 0xFF] << 8 | sbox[s1 & 0xFF]) ^ ek[58]
+        w3 = (sbox[s3 >> 24] << 24 | sbox[(s0 >> 16) & 0xFF] << 16 | sbox[(s1 >> 8) & 0xFF] << 8 | sbox[s2 & 0xFF]) ^ ek[59]
+        return (w0 << 96 | w1 << 64 | w2 << 32 | w3).to_bytes(16, "big")
+
+    def _encrypt_block_ref(self, block: bytes) -> bytes:
+        """Step-by-step FIPS-197 rounds; reference for the T-table path."""
         if len(block) != 16:
             raise ValueError("block must be 16 bytes")
         state = bytearray(block)
@@ -209,6 +287,31 @@ class AES256CBC:
         return bytes(state)
 
     def decrypt_block(self, block: bytes) -> bytes:
+        if len(block) != 16:
+            raise ValueError("block must be 16 bytes")
+        td0, td1, td2, td3, isbox = _TD0, _TD1, _TD2, _TD3, _INV_SBOX
+        dk = self._dk
+        x = int.from_bytes(block, "big")
+        s0 = (x >> 96) ^ dk[56]
+        s1 = ((x >> 64) & 0xFFFFFFFF) ^ dk[57]
+        s2 = ((x >> 32) & 0xFFFFFFFF) ^ dk[58]
+        s3 = (x & 0xFFFFFFFF) ^ dk[59]
+        for k in range(52, 0, -4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ dk[k],
+                td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ dk[k + 1],
+                td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ dk[k + 2],
+                td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ dk[k + 3],
+            )
+        # final round: InvShiftRows + InvSubBytes + AddRoundKey (no InvMixColumns)
+        w0 = (isbox[s0 >> 24] << 24 | isbox[(s3 >> 16) & 0xFF] << 16 | isbox[(s2 >> 8) & 0xFF] << 8 | isbox[s1 & 0xFF]) ^ dk[0]
+        w1 = (isbox[s1 >> 24] << 24 | isbox[(s0 >> 16) & 0xFF] << 16 | isbox[(s3 >> 8) & 0xFF] << 8 | isbox[s2 & 0xFF]) ^ dk[1]
+        w2 = (isbox[s2 >> 24] << 24 | isbox[(s1 >> 16) & 0xFF] << 16 | isbox[(s0 >> 8) & 0xFF] << 8 | isbox[s3 & 0xFF]) ^ dk[2]
+        w3 = (isbox[s3 >> 24] << 24 | isbox[(s2 >> 16) & 0xFF] << 16 | isbox[(s1 >> 8) & 0xFF] << 8 | isbox[s0 & 0xFF]) ^ dk[3]
+        return (w0 << 96 | w1 << 64 | w2 << 32 | w3).to_bytes(16, "big")
+
+    def _decrypt_block_ref(self, block: bytes) -> bytes:
+        """Step-by-step FIPS-197 inverse rounds; reference for the T-table path."""
         if len(block) != 16:
             raise ValueError("block must be 16 bytes")
         state = bytearray(block)
@@ -244,22 +347,28 @@ class AES256CBC:
             raise ValueError("invalid padding")
         return data[:-pad_len]
 
-    def encrypt_cbc(self, iv: bytes, plaintext: bytes) -> bytes:
+    def encrypt_cbc(self, iv: bytes, plaintext: bytes, pad: bool = True) -> bytes:
+        # pad=False encrypts block-aligned data as-is (raw CBC, e.g. test vectors)
         if not isinstance(plaintext, (bytes, bytearray)):
             raise TypeError("plaintext must be bytes")
         if len(iv) != 16:
             raise ValueError("IV must be 16 bytes")
-        pt = self._pkcs7_pad(bytes(plaintext), 16)
+        if pad:
+            pt = self._pkcs7_pad(bytes(plaintext), 16)
+        elif len(plaintext) % 16 != 0:
+            raise ValueError("plaintext length must be multiple of 16")
+        else:
+            pt = bytes(plaintext)
         out = bytearray()
         prev = iv
         for i in range(0, len(pt), 16):
-            block = bytes(a ^ b for a, b in zip(pt[i:i+16], prev))
+            block = _xor16(pt[i:i+16], prev)
             enc = self.encrypt_block(block)
             out.extend(enc)
             prev = enc
         return bytes(out)
 
-    def decrypt_cbc(self, iv: bytes, ciphertext: bytes) -> bytes:
+    def decrypt_cbc(self, iv: bytes, ciphertext: bytes, pad: bool = True) -> bytes:
         if not isinstance(ciphertext, (bytes, bytearray)):
             raise TypeError("ciphertext must be bytes")
         if len(iv) != 16:
@@ -271,9 +380,9 @@ class AES256CBC:
         for i in range(0, len(ciphertext), 16):
             block = ciphertext[i:i+16]
             dec = self.decrypt_block(block)
-            out.extend(bytes(a ^ b for a, b in zip(dec, prev)))
+            out.extend(_xor16(dec, prev))
             prev = block
-        return self._pkcs7_unpad(bytes(out), 16)
+        return self._pkcs7_unpad(bytes(out), 16) if pad else bytes(out)
 
 
 # ---------------------------
@@ -281,6 +390,11 @@ class AES256CBC:
 # ---------------------------
 
 def pbkdf2_sha256(password: bytes, salt: bytes, iterations: int, dklen: int = 32) -> bytes:
+    """PBKDF2-HMAC-SHA256 via hashlib.pbkdf2_hmac.
+
+    The whole derivation runs in OpenSSL's C implementation (SHA extensions
+    where the CPU has them); only argument checks happen in Python.
+    """
     if not isinstance(password, (bytes, bytearray)):
         raise TypeError("password must be bytes")
     if not isinstance(salt, (bytes, bytearray)):
@@ -21,6 +21,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import re
 import subprocess
 import sys
 from typing import Any, Dict, Optional
@@ -157,6 +158,11 @@ def get_cores() -> int:
 # GPU helpers (nvidia-smi or WMI)
 # -----------------------------
 
+# First four CSV fields of the first line, surrounding blanks excluded
+_NVSMI_FIELD = r"[ \t]*([^,\r\n]*?)[ \t]*"
+_NVSMI_RE = re.compile(",".join([_NVSMI_FIELD] * 4) + r"(?=[,\r\n]|\Z)")
+
+
 def _detect_gpu_with_nvidia_smi() -> Optional[Dict[str, Any]]:
     """Try NVIDIA stack via nvidia-smi. Returns dict or None if unavailable.
     Output CSV: name,memory.total,driver_version,cuda_version
@@ -180,15 +186,10 @@ def _detect_gpu_with_nvidia_smi() -> Optional[Dict[str, Any]]:
 
     if cp.returncode != 0:
         return None
-    raw = (cp.stdout or "")
-    lines = [ln.strip() for ln in raw.splitlines() if ln.strip()]
-    if not lines:
-        return None
-    line = lines[0]
-    parts = [p.strip() for p in line.split(",")]
-    if len(parts) < 4:
+    m = _NVSMI_RE.match((cp.stdout or "").lstrip())
+    if m is None:
         return None
-    name, mem_mib_str, driver, cuda = parts[:4]
+    name, mem_mib_str, driver, cuda = m.groups()
     try:
         mem_mib = int(mem_mib_str)
         vram_gb = int(round(mem_mib / 1024))
@@ -3,8 +3,9 @@ import sys
 import time
 import math
 import json
+import struct
 import subprocess
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 # Public JSON schema keys for samples
 SAMPLE_KEYS = ("gpu", "vram_gb", "utilization", "temperature_c", "power_w", "timestamp")
@@ -132,9 +133,13 @@ class NvidiaSmiBackend(GPUBackend):
 
 
 class GPUMonitor:
-    """Sampling and aggregation API with pluggable backends."""
+    """Sampling and aggregation API with pluggable backends.
 
-    def __init__(self, backend: Optional[GPUBackend] = None) -> None:
+    ``clock`` supplies ``time()``, ``perf_counter()`` and ``sleep()``; it defaults
+    to the ``time`` module and can be replaced with a fake clock in tests.
+    """
+
+    def __init__(self, backend: Optional[GPUBackend] = None, clock: Any = time) -> None:
         if backend is None:
             backend_name = os.environ.get("GPU_MONITOR_BACKEND", "auto").lower()
             if backend_name == "stub":
@@ -146,6 +151,7 @@ class GPUMonitor:
                 b = NvidiaSmiBackend()
                 backend = b if b._check_available() else StubBackend()
         self.backend = backend
+        self.clock = clock
 
     def sample_once(self) -> Dict[str, Any]:
         d = self.backend.sample() or {}
@@ -157,8 +163,7 @@ class GPUMonitor:
         for k in ("gpu", "vram_gb", "utilization", "temperature_c", "power_w"):
             if k in d:
                 out[k] = d[k]
-        # timestamp last to avoid monkeypatch conflicts
-        out["timestamp"] = float(time.time())
+        out["timestamp"] = float(self.clock.time())
         return out
 
     def watch(
@@ -177,8 +182,9 @@ class GPUMonitor:
         if duration_sec is not None and duration_sec < 0:
             raise ValueError("duration_sec must be >= 0")
 
+        clock = self.clock
         samples: List[Dict[str, Any]] = []
-        start = time.perf_counter()
+        start = clock.perf_counter()
         next_tick = start + interval_sec
         if duration_sec is None:
             # Run until externally stopped; here we limit to a safety cap to avoid runaway in tests.
@@ -188,10 +194,10 @@ class GPUMonitor:
         # expected count
         expected = int(duration_sec / interval_sec + 1e-9) if duration_sec > 0 else 0
         while duration_sec > 0 and next_tick <= end + 1e-9:
-            now = time.perf_counter()
+            now = clock.perf_counter()
             sleep_time = next_tick - now
             if sleep_time > 0:
-                time.sleep(sleep_time)
+                clock.sleep(sleep_time)
             s = self.sample_once()
             samples.append(s)
             if callback:
@@ -244,7 +250,17 @@ class ImageRenderer:
                 err += dx
                 y += sy
 
-    def plot(self, samples: List[Dict[str, Any]], total_vram_gb: Optional[float] = None) -> None:
+    def plot(
+        self,
+        samples: Union[List[Dict[str, Any]], Mapping[str, Sequence[Any]]],
+        total_vram_gb: Optional[float] = None,
+    ) -> None:
+        """Plot utilization (green) and VRAM (blue) over time.
+
+        ``samples`` is either a list of sample dicts (as returned by
+        GPUMonitor.watch) or a columnar mapping such as
+        ``{"utilization": array('d', ...), "vram_gb": array('d', ...)}``.
+        """
         # Draw axes background (dark gray)
         for y in range(self.h):
             row = y * self.w * 3
@@ -256,7 +272,14 @@ class ImageRenderer:
             self._put_pixel(x, self.h - 1, (80, 80, 80))
         for y in range(self.h):
             self._put_pixel(0, y, (80, 80, 80))
-        n = len(samples)
+        if isinstance(samples, Mapping):
+            utils: Sequence[Any] = samples.get("utilization") or ()
+            vrams: Sequence[Any] = samples.get("vram_gb") or ()
+            n = max(len(utils), len(vrams))
+        else:
+            n = len(samples)
+            utils = [s.get("utilization") for s in samples]
+            vrams = [s.get("vram_gb") for s in samples]
         if n <= 1:
             return
         # X spacing
@@ -265,7 +288,7 @@ class ImageRenderer:
 
         max_vram = total_vram_gb
         if max_vram is None:
-            vals = [s.get("vram_gb") for s in samples if isinstance(s.get("vram_gb"), (int, float))]
+            vals = [v for v in vrams if isinstance(v, (int, float))]
             max_vram = max(vals) if vals else None
         if not max_vram or max_vram <= 0:
             max_vram = 1.0  # avoid div by zero
@@ -275,9 +298,9 @@ class ImageRenderer:
         # Utilization: 0..100 -> top..bottom
         util_pts: List[Tuple[int, int]] = []
         vram_pts: List[Tuple[int, int]] = []
-        for i, s in enumerate(samples):
-            util = s.get("utilization")
-            vram = s.get("vram_gb")
+        for i in range(n):
+            util = utils[i] if i < len(utils) else None
+            vram = vrams[i] if i < len(vrams) else None
             u = 0.0 if not isinstance(util, (int, float)) else float(util)
             u = clamp(u, 0.0, 100.0)
             # invert y (0 at bottom)
@@ -299,67 +322,29 @@ class ImageRenderer:
             self._draw_line(x0, y0, x1, y1, (0, 128, 255))  # blue
 
     def save_ppm(self, path: str) -> None:
+        header = b"P6\n%d %d\n255\n" % (self.w, self.h)
         with open(path, "wb") as f:
-            header = f"P6\n{self.w} {self.h}\n255\n".encode("ascii")
-            f.write(header)
-            f.write(self.pixels)
+            f.write(header + self.pixels)
 
     def save_bmp(self, path: str) -> None:
         # 24-bit BMP, rows bottom-up, padded to 4-byte boundaries
-        row_stride = (self.w * 3 + 3) & ~3
+        row_bytes = self.w * 3
+        row_stride = (row_bytes + 3) & ~3
         image_size = row_stride * self.h
-        file_size = 14 + 40 + image_size
-        # BITMAPFILEHEADER
-        bfType = b"BM"
-        bfSize = file_size.to_bytes(4, "little")
-        bfReserved1 = (0).to_bytes(2, "little")
-        bfReserved2 = (0).to_bytes(2, "little")
-        bfOffBits = (14 + 40).to_bytes(4, "little")
-        # BITMAPINFOHEADER
-        biSize = (40).to_bytes(4, "little")
-        biWidth = int(self.w).to_bytes(4, "little", signed=True)
-        biHeight = int(self.h).to_bytes(4, "little", signed=True)
-        biPlanes = (1).to_bytes(2, "little")
-        biBitCount = (24).to_bytes(2, "little")
-        biCompression = (0).to_bytes(4, "little")
-        biSizeImage = image_size.to_bytes(4, "little")
-        biXPelsPerMeter = (2835).to_bytes(4, "little")  # ~72 DPI
-        biYPelsPerMeter = (2835).to_bytes(4, "little")
-        biClrUsed = (0).to_bytes(4, "little")
-        biClrImportant = (0).to_bytes(4, "little")
+        # BITMAPFILEHEADER + BITMAPINFOHEADER (~72 DPI)
+        header = struct.pack(
+            "<2sIHHIIiiHHIIiiII",
+            b"BM", 14 + 40 + image_size, 0, 0, 14 + 40,
+            40, self.w, self.h, 1, 24, 0, image_size, 2835, 2835, 0, 0,
+        )
+        # RGB -> BGR for the whole frame with three strided slice copies
+        bgr = bytearray(self.pixels)
+        bgr[0::3] = self.pixels[2::3]
+        bgr[2::3] = self.pixels[0::3]
+        pad = b"\x00" * (row_stride - row_bytes)
+        rows = [bgr[y * row_bytes:(y + 1) * row_bytes] for y in range(self.h - 1, -1, -1)]
         with open(path, "wb") as f:
-            f.write(bfType)
-            f.write(bfSize)
-            f.write(bfReserved1)
-            f.write(bfReserved2)
-            f.write(bfOffBits)
-            f.write(biSize)
-            f.write(biWidth)
-            f.write(biHeight)
-            f.write(biPlanes)
-            f.write(biBitCount)
-            f.write(biCompression)
-            f.write(biSizeImage)
-            f.write(biXPelsPerMeter)
-            f.write(biYPelsPerMeter)
-            f.write(biClrUsed)
-            f.write(biClrImportant)
-            # Pixel data: bottom-up rows, BGR order with padding
-            pad = b"\x00" * (row_stride - self.w * 3)
-            for row in range(self.h):
-                y = self.h - 1 - row
-                base = y * self.w * 3
-                # convert RGB to BGR
-                row_bytes = bytearray()
-                for x in range(self.w):
-                    idx = base + x * 3
-                    r = self.pixels[idx]
-                    g = self.pixels[idx + 1]
-                    b = self.pixels[idx + 2]
-                    row_bytes += bytes((b, g, r))
-                f.write(row_bytes)
-                if pad:
-                    f.write(pad)
+            f.write(header + pad.join(rows) + pad)
 
 
 __all__ = [
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import io
 import json
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import List, Tuple, Dict, Any, Optional
 
 
@@ -52,13 +54,7 @@ class LocalOCR(OCR):
         # Label components
         regions = _connected_components(fg, w, h)
         # Convert to result format
-        regions_out = []
-        for idx, r in enumerate(regions):
-            x, y, w0, h0 = r.bbox
-            regions_out.append({
-                "bbox": [int(x), int(y), int(w0), int(h0)],
-                "text": r.text,
-            })
+        regions_out = [{"bbox": list(r.bbox), "text": r.text} for r in regions]
         result = {
             "regions": regions_out,
             "engine": "local-ocr",
@@ -78,46 +74,29 @@ def _sniff_format(b: bytes) -> str:
     return "UNKNOWN"
 
 
+# Header whitespace and comments; a comment always runs to the end of its line
+_PNM_SKIP = rb"(?:\s|#[^\r\n]*[\r\n])*"
+# width, height, maxval: each ends in whitespace (maxval may also end the input)
+_PNM_HEADER_RE = re.compile(
+    _PNM_SKIP + rb"(\d+)\s" + _PNM_SKIP + rb"(\d+)\s" + _PNM_SKIP + rb"(\d+)(?:\s|\Z)"
+)
+
+
 def _parse_pnm_to_grayscale(b: bytes) -> Tuple[int, int, bytearray]:
     # Parse header tokens (magic, width, height, maxval) while skipping comments
     magic = b[0:2].decode("ascii")
     stream = memoryview(b)
-    idx = 2
-
-    def _read_token() -> str:
-        nonlocal idx
-        n = len(stream)
-        # Skip whitespace
-        while idx < n and chr(stream[idx]).isspace():
-            idx += 1
-        if idx >= n:
-            raise ValueError("invalid PNM header")
-        # Skip comments
-        if stream[idx] == ord('#'):
-            # skip to end of line
-            while idx < n and stream[idx] not in (10, 13):
-                idx += 1
-            return _read_token()
-        # Read token until whitespace
-        start = idx
-        while idx < n and not chr(stream[idx]).isspace():
-            idx += 1
-        return bytes(stream[start:idx]).decode("ascii")
-
-    try:
-        w = int(_read_token())
-        h = int(_read_token())
-        maxval = int(_read_token())
-    except Exception:
+    m = _PNM_HEADER_RE.match(b, 2)
+    if m is None:
         raise ValueError("invalid PNM header")
+    w, h, maxval = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    # The match includes the single whitespace byte that ends maxval
+    idx = m.end()
     if w <= 0 or h <= 0 or maxval <= 0:
         raise ValueError("invalid PNM dimensions")
 
-    # After reading maxval, the next byte should be a single whitespace then data for P5/P6
+    # After maxval and its single whitespace byte comes the data for P5/P6
     if magic in ("P5", "P6"):
-        # Skip a single whitespace
-        if idx < len(stream) and chr(stream[idx]).isspace():
-            idx += 1
         data = bytes(stream[idx:])
         if magic == "P5":
             expected = w * h
@@ -268,87 +247,95 @@ def _threshold(gray: bytearray, w: int, h: int, th: int) -> bytearray:
 
 
 def _connected_components(fg: bytearray, w: int, h: int) -> List[Region]:
-    n = w * h
-    visited = bytearray(n)
-    regions: List[Region] = []
-
-    def idx_xy(x: int, y: int) -> int:
-        return y * w + x
-
+    # Run-based two-pass labeling: extract horizontal foreground runs per row,
+    # union runs that overlap the previous row (4-connectivity), then reduce.
+    runs_s: List[int] = []  # run start x (inclusive)
+    runs_e: List[int] = []  # run end x (exclusive)
+    runs_y: List[int] = []
+    parent: List[int] = []
+
+    def find(i: int) -> int:
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    prev_lo = prev_hi = 0  # run index range of the previous row
     for y in range(h):
         base = y * w
-        for x in range(w):
-            i = base + x
-            if fg[i] == 0 or visited[i] == 1:
-                continue
-            # New component: flood fill
-            minx = x
-            miny = y
-            maxx = x
-            maxy = y
-            area = 0
-            stack = [i]
-            visited[i] = 1
-            while stack:
-                cur = stack.pop()
-                cy, cx = divmod(cur, w)[0], divmod(cur, w)[1]
-                # above line is inefficient; compute as:
-                cy = cur // w
-                cx = cur - cy * w
-                if cx < minx:
-                    minx = cx
-                if cx > maxx:
-                    maxx = cx
-                if cy < miny:
-                    miny = cy
-                if cy > maxy:
-                    maxy = cy
-                area += 1
-                # neighbors 4-connectivity
-                # left
-                if cx > 0:
-                    ni = cur - 1
-                    if fg[ni] == 1 and visited[ni] == 0:
-                        visited[ni] = 1
-                        stack.append(ni)
-                # right
-                if cx + 1 < w:
-                    ni = cur + 1
-                    if fg[ni] == 1 and visited[ni] == 0:
-                        visited[ni] = 1
-                        stack.append(ni)
-                # up
-                if cy > 0:
-                    ni = cur - w
-                    if fg[ni] == 1 and visited[ni] == 0:
-                        visited[ni] = 1
-                        stack.append(ni)
-                # down
-                if cy + 1 < h:
-                    ni = cur + w
-                    if fg[ni] == 1 and visited[ni] == 0:
-                        visited[ni] = 1
-                        stack.append(ni)
-            bbox = (minx, miny, maxx - minx + 1, maxy - miny + 1)
-            # Deterministic text based on bbox and area
-            text = _region_text(area, bbox)
-            regions.append(Region(bbox=bbox, text=text))
-
-    # Sort by x, then y for determinism
-    regions.sort(key=lambda r: (r.bbox[0], r.bbox[1]))
-    return regions
+        row_end = base + w
+        lo = len(runs_s)
+        x = fg.find(1, base, row_end)
+        while x != -1:
+            e = fg.find(0, x, row_end)
+            if e == -1:
+                e = row_end
+            parent.append(len(runs_s))
+            runs_s.append(x - base)
+            runs_e.append(e - base)
+            runs_y.append(y)
+            x = fg.find(1, e, row_end) if e < row_end else -1
+        hi = len(runs_s)
+        # Merge with overlapping runs of the previous row (two-pointer sweep)
+        i, j = prev_lo, lo
+        while i < prev_hi and j < hi:
+            if runs_s[i] < runs_e[j] and runs_s[j] < runs_e[i]:
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    if ri < rj:
+                        parent[rj] = ri
+                    else:
+                        parent[ri] = rj
+            if runs_e[i] <= runs_e[j]:
+                i += 1
+            else:
+                j += 1
+        prev_lo, prev_hi = lo, hi
+
+    # Reduce runs per component; runs are in raster order, so the first run seen
+    # for a root is the component's first pixel in scan order.
+    stats: Dict[int, List[int]] = {}
+    order: List[int] = []
+    for k in range(len(runs_s)):
+        r = find(k)
+        s0, e0, y0 = runs_s[k], runs_e[k], runs_y[k]
+        st = stats.get(r)
+        if st is None:
+            stats[r] = [s0, y0, e0 - 1, y0, e0 - s0]
+            order.append(r)
+            continue
+        if s0 < st[0]:
+            st[0] = s0
+        if e0 - 1 > st[2]:
+            st[2] = e0 - 1
+        st[3] = y0
+        st[4] += e0 - s0
+
+    # Plain (x, y, w, h, area) tuples; stable sort by x, then y for determinism
+    comps: List[Tuple[int, int, int, int, int]] = []
+    for r in order:
+        minx, miny, maxx, maxy, area = stats[r]
+        comps.append((minx, miny, maxx - minx + 1, maxy - miny + 1, area))
+    comps.sort(key=itemgetter(0, 1))
+    # Materialize Regions once, with deterministic text based on bbox and area
+    return [Region(bbox=c[:4], text=_region_text(c[4], c[:4])) for c in comps]
+
+
+_ALPHA = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+# Two base-36 digits per entry, least significant first: _ALPHA2[v] for v < 36**2
+_ALPHA2 = tuple(_ALPHA[v % 36] + _ALPHA[v // 36] for v in range(36 * 36))
 
 
 def _region_text(area: int, bbox: Tuple[int, int, int, int]) -> str:
     x, y, w, h = bbox
     # Simple deterministic pseudo text: base36-like from area and bbox sum
     val = (area * 1315423911 + x * 2654435761 + y * 97 + w * 31 + h * 17) & 0xFFFFFFFF
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    out = []
-    for _ in range(6):
-        out.append(alphabet[val % len(alphabet)])
-        val //= len(alphabet)
-    return "".join(out)
+    # Six base-36 digits, least significant first, two at a time
+    val, lo = divmod(val, 1296)
+    val, mid = divmod(val, 1296)
+    return _ALPHA2[lo] + _ALPHA2[mid] + _ALPHA2[val % 1296]
 
 
 __all__ = ["OCR", "LocalOCR", "Region"]
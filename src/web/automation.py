@@ -1,6 +1,8 @@
 import os
 import time
-from typing import List, Optional, Dict, Any, Iterable
+import struct
+from functools import lru_cache
+from typing import Callable, List, Optional, Dict, Any, Iterable, Tuple
 from html.parser import HTMLParser
 import threading
 
@@ -12,6 +14,8 @@ class _Node:
         self.children: List[_Node] = []
         self.parent = parent
         self.text: str = ""
+        # Class names split once so .class selectors are a set lookup
+        self.classes: frozenset = _split_classes(self.attrs.get("class", ""))
 
     def add_child(self, node: "_Node") -> None:
         node.parent = self
@@ -24,14 +28,7 @@ class _Node:
 
     def matches_simple(self, simple: str) -> bool:
         # simple can be: #id, .class, tag
-        if simple.startswith("#"):
-            return self.attrs.get("id", "") == simple[1:]
-        if simple.startswith("."):
-            cls = self.attrs.get("class", "")
-            classes = [s for s in cls.replace("\t", " ").replace("\n", " ").split(" ") if s]
-            return simple[1:] in classes
-        # tag
-        return self.tag == simple.lower()
+        return _compile_simple(simple)(self)
 
     def get_ancestors(self) -> List["_Node"]:
         out = []
@@ -53,79 +50,188 @@ class _Node:
         return "".join(parts)
 
 
+# Elements that never have children and so are never pushed on the open-tag stack
+_VOID_TAGS = frozenset({"br", "img", "meta", "input", "hr", "link"})
+
+# Read size used when streaming HTML files into the parser
+_READ_CHUNK = 64 * 1024
+
+
 class _DOMBuilder(HTMLParser):
     def __init__(self):
         super().__init__(convert_charrefs=True)
         self.root = _Node("document")
         self.stack: List[_Node] = [self.root]
+        # Stack indices of open elements per tag, so end tags resolve in O(1)
+        self._tag_positions: Dict[str, List[int]] = {}
+        # Element index filled as start tags arrive (same layout as _build_index)
+        self.index: Dict["_Step", List[_Node]] = {}
+        _index_node(self.index, self.root)
 
     def handle_starttag(self, tag, attrs):
-        node = _Node(tag.lower(), {k: (v if v is not None else "") for k, v in attrs})
-        self.stack[-1].add_child(node)
+        # HTMLParser already lower-cases tag and attribute names
+        parent = self.stack[-1]
+        node = _Node(tag, {k: (v if v is not None else "") for k, v in attrs}, parent)
+        parent.children.append(node)
+        # Start tags arrive in document order, so the index lists stay sorted
+        _index_node(self.index, node)
         # Void elements shouldn't push to stack
-        if tag.lower() not in {"br", "img", "meta", "input", "hr", "link"}:
+        if tag not in _VOID_TAGS:
+            self._tag_positions.setdefault(tag, []).append(len(self.stack))
             self.stack.append(node)
 
     def handle_endtag(self, tag):
         tag = tag.lower()
-        # Pop until we find matching tag or root
-        for i in range(len(self.stack) - 1, 0, -1):
-            if self.stack[i].tag == tag:
-                del self.stack[i:]
-                break
+        # Pop up to the innermost open element with this tag; ignore strays
+        positions = self._tag_positions.get(tag)
+        if not positions:
+            return
+        i = positions[-1]
+        for node in self.stack[i:]:
+            self._tag_positions[node.tag].pop()
+        del self.stack[i:]
 
     def handle_data(self, data):
         if not data:
             return
-        node = _Node(None)
+        parent = self.stack[-1]
+        node = _Node(None, None, parent)
         node.text = data
-        self.stack[-1].add_child(node)
+        parent.children.append(node)
 
 
 class SelectorEngine:
     @staticmethod
     def query_all(root: _Node, selector: str) -> List[_Node]:
         # Support descendant selectors split by spaces and simple tokens (#id, .class, tag)
-        tokens = [tok for tok in selector.strip().split(" ") if tok]
-        if not tokens:
+        return SelectorEngine.query_steps(root, _parse_selector(selector))
+
+    @staticmethod
+    def query_indexed(index: Dict["_Step", List[_Node]], steps: "_Selector") -> List[_Node]:
+        """Same result as query_steps, answered from a page's node index.
+
+        Index lists are in document order, so each step keeps the candidates
+        that have an ancestor-or-self among the previous step's matches.
+        """
+        if not steps:
+            return []
+        current = index.get(steps[0], [])
+        for step in steps[1:]:
+            if not current:
+                break
+            scope = set(map(id, current))
+            out: List[_Node] = []
+            for cand in index.get(step, ()):
+                n: Optional[_Node] = cand
+                while n is not None:
+                    if id(n) in scope:
+                        out.append(cand)
+                        break
+                    n = n.parent
+            current = out
+        return list(current)
+
+    @staticmethod
+    def query_steps(root: _Node, steps: "_Selector") -> List[_Node]:
+        predicates = [_step_predicate(step) for step in steps]
+        if not predicates:
             return []
 
-        def match_token(nodes: List[_Node], tok: str) -> List[_Node]:
+        def match_token(nodes: List[_Node], pred: Callable[[_Node], bool]) -> List[_Node]:
+            # Each step matches the node itself or any descendant, in document order
             out: List[_Node] = []
+            seen = set()
             for n in nodes:
-                for d in ([n] + list(n.iter_descendants())):
+                stack = [n]
+                while stack:
+                    d = stack.pop()
                     if d.tag is None:
                         continue
-                    if d.matches_simple(tok):
+                    if pred(d) and id(d) not in seen:
+                        seen.add(id(d))
                         out.append(d)
+                    stack.extend(reversed(d.children))
             return out
 
         current = [root]
-        for tok in tokens:
-            current = match_token(current, tok)
+        for pred in predicates:
+            current = match_token(current, pred)
             if not current:
                 break
-        # De-duplicate while preserving order
-        seen = set()
-        unique: List[_Node] = []
-        for n in current:
-            if id(n) not in seen:
-                seen.add(id(n))
-                unique.append(n)
-        return unique
+        return current
+
+
+def _index_node(index: Dict["_Step", List[_Node]], n: _Node) -> None:
+    # Every element goes under its tag, its id ("" when absent, matching the
+    # #id predicate) and each class; callers add nodes in document order
+    index.setdefault(("tag", n.tag), []).append(n)
+    index.setdefault(("id", n.attrs.get("id", "")), []).append(n)
+    for c in n.classes:
+        index.setdefault(("class", c), []).append(n)
+
+
+def _build_index(root: _Node) -> Dict["_Step", List[_Node]]:
+    # Rebuild after DOM edits with one pre-order walk
+    index: Dict[_Step, List[_Node]] = {}
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if n.tag is None:
+            continue
+        _index_node(index, n)
+        stack.extend(reversed(n.children))
+    return index
+
+
+def _split_classes(cls: str) -> frozenset:
+    return frozenset(s for s in cls.replace("\t", " ").replace("\n", " ").split(" ") if s)
+
+
+# A parsed simple selector: ("id" | "class" | "tag", value)
+_Step = Tuple[str, str]
+# A parsed descendant selector: one step per space-separated token
+_Selector = Tuple[_Step, ...]
+
+
+def _parse_simple(simple: str) -> _Step:
+    if simple.startswith("#"):
+        return ("id", simple[1:])
+    if simple.startswith("."):
+        return ("class", simple[1:])
+    return ("tag", simple.lower())
+
+
+@lru_cache(maxsize=1024)
+def _parse_selector(selector: str) -> _Selector:
+    # Descendant selectors split by spaces; one step per simple token
+    return tuple(_parse_simple(tok) for tok in selector.strip().split(" ") if tok)
+
+
+@lru_cache(maxsize=256)
+def _step_predicate(step: _Step) -> Callable[[_Node], bool]:
+    kind, value = step
+    if kind == "id":
+        return lambda n: n.attrs.get("id", "") == value
+    if kind == "class":
+        return lambda n: value in n.classes
+    return lambda n: n.tag == value
+
+
+def _compile_simple(simple: str) -> Callable[[_Node], bool]:
+    return _step_predicate(_parse_simple(simple))
 
 
 class Locator:
     def __init__(self, page: "Page", selector: str, nodes: Optional[List[_Node]] = None):
         self._page = page
         self._selector = selector
+        # Parsed once per distinct selector string (shared via _parse_selector's cache)
+        self._steps = _parse_selector(selector)
         self._nodes_cache: Optional[List[_Node]] = nodes
 
     def _nodes(self) -> List[_Node]:
         if self._nodes_cache is None:
-            if self._page._root is None:
-                return []
-            self._nodes_cache = SelectorEngine.query_all(self._page._root, self._selector)
+            self._nodes_cache = self._page._query(self._steps)
         return self._nodes_cache
 
     def first(self) -> "Locator":
@@ -156,6 +262,8 @@ class Locator:
             t = _Node(None)
             t.text = text
             node.add_child(t)
+            # removed elements must drop out of the page's index and results
+            self._page._dom_changed()
 
     def get_text(self) -> str:
         ns = self._nodes()
@@ -177,6 +285,29 @@ class Page:
     def __init__(self):
         self._root: Optional[_Node] = None
         self.url: Optional[str] = None
+        # Elements keyed by selector step, built on load and after DOM edits
+        self._index: Optional[Dict[_Step, List[_Node]]] = None
+        # Matches per parsed selector; only tree edits change them, since
+        # click/fill attribute writes never touch id, class or tag
+        self._query_cache: Dict[_Selector, List[_Node]] = {}
+
+    def _node_index(self) -> Optional[Dict["_Step", List[_Node]]]:
+        if self._index is None and self._root is not None:
+            self._index = _build_index(self._root)
+        return self._index
+
+    def _query(self, steps: "_Selector") -> List[_Node]:
+        nodes = self._query_cache.get(steps)
+        if nodes is None:
+            index = self._node_index()
+            if index is None:
+                return []
+            nodes = self._query_cache[steps] = SelectorEngine.query_indexed(index, steps)
+        return nodes
+
+    def _dom_changed(self) -> None:
+        self._index = None
+        self._query_cache.clear()
 
     def goto(self, url: str) -> None:
         # Support file:// and plain file paths
@@ -187,12 +318,25 @@ class Page:
             if path.startswith("/") and os.name == "nt":
                 # /C:/path -> C:/path
                 path = path[1:]
+        # Stream the file through the parser instead of materializing it first
+        parser = _DOMBuilder()
         with open(path, "r", encoding="utf-8") as f:
-            html = f.read()
-        self.url = url
+            for chunk in iter(lambda: f.read(_READ_CHUNK), ""):
+                parser.feed(chunk)
+        self._load(parser, url)
+
+    def goto_html(self, html: str, url: Optional[str] = None) -> None:
+        # Load markup held in memory; url only labels the page
         parser = _DOMBuilder()
         parser.feed(html)
+        self._load(parser, url)
+
+    def _load(self, parser: _DOMBuilder, url: Optional[str]) -> None:
+        parser.close()
+        self.url = url
         self._root = parser.root
+        self._index = parser.index
+        self._query_cache.clear()
 
     def locator(self, selector: str) -> Locator:
         return Locator(self, selector)
@@ -221,8 +365,13 @@ class Page:
             (128, 128, 128),  # gray
             (255, 0, 0),      # red
         ]
-        pixels = [colors[(total + i) % 4] for i in range(width * height)]
-        bmp_bytes = _make_bmp_bytes(width, height, pixels)
+        # Pixel i is colors[(total + i) % 4], so the image is one 4-pixel BGR
+        # cycle repeated from the right offset
+        start = total % 4
+        cycle = bytes(c for r, g, b in colors[start:] + colors[:start] for c in (b, g, r))
+        n = width * height
+        bgr = (cycle * (n // 4 + 1))[:n * 3]
+        bmp_bytes = _make_bmp_header(width, height) + _bgr_rows(bgr, width, height)
         with open(path, "wb") as f:
             f.write(bmp_bytes)
 
@@ -249,59 +398,24 @@ class Browser:
             self._closed = True
 
 
-def _make_bmp_bytes(width: int, height: int, pixels: List[tuple]) -> bytes:
+@lru_cache(maxsize=32)
+def _make_bmp_header(width: int, height: int) -> bytes:
     # 24-bit BMP with no compression, bottom-up rows, row padding to 4 bytes
     row_stride = (width * 3 + 3) & ~3
     pixel_data_size = row_stride * height
-    file_size = 14 + 40 + pixel_data_size
-
-    # BITMAPFILEHEADER
-    bfType = b"BM"
-    bfSize = file_size.to_bytes(4, "little")
-    bfReserved = (0).to_bytes(4, "little")
-    bfOffBits = (14 + 40).to_bytes(4, "little")
-
-    # BITMAPINFOHEADER (40 bytes)
-    biSize = (40).to_bytes(4, "little")
-    biWidth = (width).to_bytes(4, "little", signed=True)
-    biHeight = (height).to_bytes(4, "little", signed=True)
-    biPlanes = (1).to_bytes(2, "little")
-    biBitCount = (24).to_bytes(2, "little")
-    biCompression = (0).to_bytes(4, "little")
-    biSizeImage = pixel_data_size.to_bytes(4, "little")
-    biXPelsPerMeter = (2835).to_bytes(4, "little")  # ~72 DPI
-    biYPelsPerMeter = (2835).to_bytes(4, "little")
-    biClrUsed = (0).to_bytes(4, "little")
-    biClrImportant = (0).to_bytes(4, "little")
-
-    header = (
-        bfType
-        + bfSize
-        + bfReserved
-        + bfOffBits
-        + biSize
-        + biWidth
-        + biHeight
-        + biPlanes
-        + biBitCount
-        + biCompression
-        + biSizeImage
-        + biXPelsPerMeter
-        + biYPelsPerMeter
-        + biClrUsed
-        + biClrImportant
+    return struct.pack(
+        "<2sIHHIIiiHHIIiiII",
+        # BITMAPFILEHEADER: type, file size, two reserved words, pixel offset
+        b"BM", 14 + 40 + pixel_data_size, 0, 0, 14 + 40,
+        # BITMAPINFOHEADER (40 bytes)
+        40, width, height, 1, 24, 0, pixel_data_size,
+        2835, 2835,  # ~72 DPI
+        0, 0,
     )
 
-    # Pixel data: BMP stores rows bottom-up, each pixel B,G,R
-    rows: List[bytes] = []
-    for y in range(height - 1, -1, -1):
-        row = bytearray()
-        for x in range(width):
-            r, g, b = pixels[y * width + x]
-            row.extend(bytes([b, g, r]))
-        # pad
-        while len(row) % 4 != 0:
-            row.append(0)
-        rows.append(bytes(row))
-
-    return header + b"".join(rows)
+
+def _bgr_rows(bgr: bytes, width: int, height: int) -> bytes:
+    # Flip top-down BGR pixel data into padded bottom-up BMP rows
+    w3 = width * 3
+    pad = b"\0" * (((w3 + 3) & ~3) - w3)
+    return b"".join(bgr[y * w3:(y + 1) * w3] + pad for y in range(height - 1, -1, -1))
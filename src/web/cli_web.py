@@ -66,11 +66,8 @@ def _run_actions(page, actions):
     return results
 
 
-def main(argv=None) -> int:
-    argv = sys.argv[1:] if argv is None else argv
-    parser = _build_parser()
-    args = parser.parse_args(argv)
-
+def _run(args) -> dict:
+    """Run the page/actions named by parsed args and return {"results": [...]}."""
     if args.plan:
         with open(args.plan, "r", encoding="utf-8") as f:
             plan = json.load(f)
@@ -118,11 +115,20 @@ def main(argv=None) -> int:
         results = _run_actions(page, action_strs)
     finally:
         br.close()
+    return {"results": results}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    out = _run(args)
 
     if args.json or args.plan:
-        sys.stdout.write(json.dumps({"results": results}))
+        sys.stdout.write(json.dumps(out))
     else:
-        for r in results:
+        for r in out["results"]:
             sys.stdout.write(f"{r}\n")
     return 0
 
@@ -2,10 +2,12 @@ import io
 import os
 import sys
 import math
-import wave
+import array
 import struct
+import functools
 import tempfile
 import unittest
+import contextlib
 import json
 
 # Ensure src is importable when running tests from repo root
@@ -14,38 +16,82 @@ SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
+# Prefer a memory-backed tmpfs for scratch files when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 from audio.asr import LocalASR  # noqa: E402
 from audio.cli_asr import main as cli_main  # noqa: E402
 
 
-def _write_wav(path: str, samples, sample_rate: int = 16000):
-    with wave.open(path, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)  # PCM16
-        wf.setframerate(sample_rate)
-        # Pack samples as little-endian 16-bit signed
-        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+def _riff_header(nsamples: int, sample_rate: int = 16000) -> bytes:
+    # 44-byte canonical WAV header for mono PCM16
+    data_len = 2 * nsamples
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_len, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, 2 * sample_rate, 2, 16,
+        b"data", data_len,
+    )
+
+
+def _write_wav(path: str, samples, sample_rate: int = 16000, silence_s: float = 0.0):
+    # Header, optional leading silence, then the samples' buffer as-is (no copy)
+    pcm = _pcm16le(samples)
+    nsilence = int(silence_s * sample_rate)
+    # Binary-mode buffered file: no newline translation, and write() writes everything
+    with open(path, "wb") as f:
+        f.write(_riff_header(nsilence + len(pcm) // 2, sample_rate))
+        if nsilence:
+            f.write(bytes(2 * nsilence))
+        f.write(pcm)
+
+
+def _pcm16le(samples) -> memoryview:
+    # Little-endian 16-bit signed as a byte view; bytes are taken to be PCM16LE
+    # already, arrays are viewed in place (copied only to byteswap on big-endian)
+    if isinstance(samples, (bytes, bytearray, memoryview)):
+        return memoryview(samples).cast("B")
+    pcm = samples if isinstance(samples, array.array) else array.array("h", samples)
+    if sys.byteorder == "big":
+        pcm = array.array("h", pcm)
+        pcm.byteswap()
+    return memoryview(pcm).cast("B")
 
 
 def _generate_tone(duration_s: float = 1.0, sample_rate: int = 16000, freq: float = 440.0, amp: int = 10000):
+    # int16 samples in one contiguous buffer (array('h')), not a list of ints
     n = int(duration_s * sample_rate)
     two_pi_f = 2.0 * math.pi * freq
-    return [int(amp * math.sin(two_pi_f * t / sample_rate)) for t in range(n)]
+    sin = math.sin
+    return array.array("h", [int(amp * sin(two_pi_f * t / sample_rate)) for t in range(n)])
+
+
+@functools.lru_cache(maxsize=8)
+def _tone_pcm16(duration_s: float = 1.0, sample_rate: int = 16000, freq: float = 440.0, amp: int = 10000) -> memoryview:
+    # Tones are deterministic: generate each parameter set once per process.
+    # Read-only view over the cached PCM16LE buffer.
+    return _pcm16le(_generate_tone(duration_s, sample_rate, freq, amp)).toreadonly()
+
+
+@functools.lru_cache(maxsize=8)
+def _tone_bytes(duration_s: float = 1.0, sample_rate: int = 16000) -> bytes:
+    return _tone_pcm16(duration_s, sample_rate).tobytes()
 
 
 class ASRTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Stateless after construction; one instance serves every test
+        cls.asr = LocalASR()
+
     def test_transcribe_wav_path(self):
-        asr = LocalASR()
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             wav_path = os.path.join(td, "tone.wav")
             # 0.2 s silence + 0.8 s tone
             sr = 16000
-            silence = [0] * int(0.2 * sr)
-            tone = _generate_tone(0.8, sr)
-            samples = silence + tone
-            _write_wav(wav_path, samples, sr)
+            _write_wav(wav_path, _tone_pcm16(0.8, sr), sr, silence_s=0.2)
 
-            res = asr.transcribe(wav_path)
+            res = self.asr.transcribe(wav_path)
             self.assertEqual(res.text, "hello")
             self.assertEqual(res.language, "en")
             self.assertEqual(res.sample_rate, sr)
@@ -53,47 +99,43 @@ class ASRTests(unittest.TestCase):
             seg = res.segments[0]
             self.assertLessEqual(0.0, seg.start)
             self.assertLess(seg.start, seg.end)
-            self.assertLessEqual(seg.end, len(samples) / sr)
+            self.assertLessEqual(seg.end, 0.2 + 0.8)
 
     def test_transcribe_raw_pcm_bytes(self):
-        asr = LocalASR()
         sr = 16000
-        samples = _generate_tone(0.5, sr)
-        raw = struct.pack(f"<{len(samples)}h", *samples)
-        res = asr.transcribe(raw)
+        raw = _tone_bytes(0.5, sr)
+        res = self.asr.transcribe(raw)
         self.assertEqual(res.text, "hello")
         self.assertEqual(res.language, "en")
         self.assertEqual(len(res.segments), 1)
 
     def test_stream_chunks(self):
-        asr = LocalASR()
         sr = 16000
-        samples = _generate_tone(0.5, sr)
-        raw = struct.pack(f"<{len(samples)}h", *samples)
+        raw = _tone_bytes(0.5, sr)
         chunks = [raw[i:i+2048] for i in range(0, len(raw), 2048)]
-        results = list(asr.stream(chunks, sample_rate=sr))
-        self.assertEqual(len(results), 1)
-        self.assertEqual(results[0].text, "hello")
-        self.assertEqual(results[0].language, "en")
+        # Consume the stream incrementally, keeping only the latest result
+        count, last = 0, None
+        for last in self.asr.stream(chunks, sample_rate=sr):
+            count += 1
+        self.assertEqual(count, 1)
+        self.assertEqual(last.text, "hello")
+        self.assertEqual(last.language, "en")
 
     def test_silence_returns_empty(self):
-        asr = LocalASR()
         sr = 16000
         silence = bytes([0, 0] * int(0.5 * sr))  # 0.5s of zeros PCM16
-        res = asr.transcribe(silence)
+        res = self.asr.transcribe(silence)
         self.assertEqual(res.text, "")
         self.assertEqual(len(res.segments), 0)
 
     def test_cli_json_output(self):
-        asr = LocalASR()
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             wav_path = os.path.join(td, "tone.wav")
             sr = 16000
-            samples = _generate_tone(0.5, sr)
-            _write_wav(wav_path, samples, sr)
+            _write_wav(wav_path, _tone_pcm16(0.5, sr), sr)
 
             buf = io.StringIO()
-            with unittest.mock.patch("sys.stdout", new=buf):
+            with contextlib.redirect_stdout(buf):
                 rc = cli_main(["--input", wav_path, "--json"])  # call main() directly
             self.assertEqual(rc, 0)
             data = json.loads(buf.getvalue())
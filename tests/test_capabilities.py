@@ -4,7 +4,9 @@ import os
 import sys
 import types
 import unittest
+import contextlib
 import ctypes
+from dataclasses import dataclass
 from unittest import mock
 
 # Ensure src is importable when running tests from repo root
@@ -17,8 +19,16 @@ import system.capabilities as caps  # noqa: E402
 from system.cli_capabilities import main as cli_main  # noqa: E402
 
 
+@dataclass(frozen=True, slots=True)
+class _CP:
+    # Minimal stand-in for subprocess.CompletedProcess
+    returncode: int = 0
+    stdout: str = ""
+    stderr: str = ""
+
+
 def _cp(returncode=0, stdout="", stderr=""):
-    return types.SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+    return _CP(returncode, stdout, stderr)
 
 
 class CapabilitiesTests(unittest.TestCase):
@@ -48,6 +58,14 @@ class CapabilitiesTests(unittest.TestCase):
         self.assertEqual(info["driver"], "555.55")
         self.assertEqual(info["cuda"], "12.2")
 
+    def test_nvidia_smi_parsing_spaced_and_malformed(self):
+        fake_out = "\n NVIDIA RTX A6000 , 49140 , 550.12 , 12.4 , extra\n"
+        with mock.patch("subprocess.run", return_value=_cp(0, fake_out, "")):
+            info = caps._detect_gpu_with_nvidia_smi()
+        self.assertEqual(info, {"gpu": "NVIDIA RTX A6000", "vram_gb": 48, "driver": "550.12", "cuda": "12.4"})
+        with mock.patch("subprocess.run", return_value=_cp(0, "OnlyTwo,123\n", "")):
+            self.assertIsNone(caps._detect_gpu_with_nvidia_smi())
+
     def test_wmi_gpu_fallback_parsing(self):
         """WMI fallback JSON should parse correctly; CUDA unknown (None)."""
         obj = {
@@ -121,7 +139,7 @@ class CapabilitiesTests(unittest.TestCase):
             "driver": "555.55",
             "cuda": "12.2",
             "ram_gb": 32,
-        }), mock.patch("sys.stdout", new=buf):
+        }), contextlib.redirect_stdout(buf):
             rc = cli_main(["--pretty"])
         self.assertEqual(rc, 0)
         data = json.loads(buf.getvalue())
@@ -3,8 +3,10 @@ import os
 import sys
 import json
 import math
+import array
 import tempfile
 import unittest
+import contextlib
 from typing import List, Dict, Any
 
 # Ensure src is importable when running tests from repo root
@@ -13,6 +15,9 @@ SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
+# Prefer a memory-backed tmpfs for scratch files when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 from system.gpu_monitor import GPUMonitor, StubBackend, ImageRenderer  # noqa: E402
 from system.cli_gpu import main as cli_main  # noqa: E402
 
@@ -49,34 +54,18 @@ class GPUMonitorTests(unittest.TestCase):
         self.assertIsNone(s["temperature_c"])
         self.assertIsNone(s["power_w"])
 
-    def test_watch_timing_monkeypatched(self):
-        # Patch time module functions within system.gpu_monitor
-        import system.gpu_monitor as gm
-
-        fc = FakeClock(start=1000.0)
-        # monkeypatch
-        orig_sleep = gm.time.sleep
-        orig_perf = gm.time.perf_counter
-        orig_time = gm.time.time
-        try:
-            gm.time.sleep = fc.sleep  # type: ignore
-            gm.time.perf_counter = fc.perf_counter  # type: ignore
-            gm.time.time = fc.time  # type: ignore
-            mon = GPUMonitor(backend=StubBackend())
-            interval = 1.0
-            duration = 10.0
-            samples = mon.watch(interval, duration)
-            # Expect exactly duration/interval samples
-            self.assertEqual(len(samples), int(duration / interval))
-            # Timestamps should increase by ~1.0 each within ±10%
-            for i in range(1, len(samples)):
-                dt = samples[i]["timestamp"] - samples[i - 1]["timestamp"]
-                self.assertGreaterEqual(dt, 0.9)
-                self.assertLessEqual(dt, 1.1)
-        finally:
-            gm.time.sleep = orig_sleep  # type: ignore
-            gm.time.perf_counter = orig_perf  # type: ignore
-            gm.time.time = orig_time  # type: ignore
+    def test_watch_timing_fake_clock(self):
+        mon = GPUMonitor(backend=StubBackend(), clock=FakeClock(start=1000.0))
+        interval = 1.0
+        duration = 10.0
+        samples = mon.watch(interval, duration)
+        # Expect exactly duration/interval samples
+        self.assertEqual(len(samples), int(duration / interval))
+        # Timestamps should increase by ~1.0 each within ±10%
+        for i in range(1, len(samples)):
+            dt = samples[i]["timestamp"] - samples[i - 1]["timestamp"]
+            self.assertGreaterEqual(dt, 0.9)
+            self.assertLessEqual(dt, 1.1)
 
     def test_image_renderer_dimensions_ppm_bmp(self):
         # Create synthetic samples
@@ -93,7 +82,7 @@ class GPUMonitorTests(unittest.TestCase):
         w, h = 80, 20
         renderer = ImageRenderer(w, h, title="Test")
         renderer.plot(samples, total_vram_gb=2.0)
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             ppm = os.path.join(td, "out.ppm")
             bmp = os.path.join(td, "out.bmp")
             renderer.save_ppm(ppm)
@@ -117,11 +106,22 @@ class GPUMonitorTests(unittest.TestCase):
                 self.assertEqual(width, w)
                 self.assertEqual(height, h)
 
+    def test_image_renderer_columnar_samples(self):
+        # Columnar (struct-of-arrays) input renders the same pixels as row dicts
+        n = 20
+        util = array.array("d", ((i * 5) % 100 for i in range(n)))
+        vram = array.array("d", (i * 0.1 for i in range(n)))
+        rows = [{"utilization": util[i], "vram_gb": vram[i]} for i in range(n)]
+        by_rows = ImageRenderer(80, 20)
+        by_rows.plot(rows, total_vram_gb=2.0)
+        by_cols = ImageRenderer(80, 20)
+        by_cols.plot({"utilization": util, "vram_gb": vram}, total_vram_gb=2.0)
+        self.assertEqual(by_cols.pixels, by_rows.pixels)
+
     def test_cli_once_json_stub(self):
         # Call CLI main directly with stub backend
         buf = io.StringIO()
-        from unittest import mock
-        with mock.patch("sys.stdout", new=buf):
+        with contextlib.redirect_stdout(buf):
             rc = cli_main(["--once", "--json", "--backend", "stub"])  # no image
         self.assertEqual(rc, 0)
         data = json.loads(buf.getvalue())
@@ -12,38 +12,52 @@ if SRC_DIR not in sys.path:
 from llm.wrappers import LocalLLM, LocalLLMConfig  # noqa: E402
 
 
-class LocalLLMTests(unittest.IsolatedAsyncioTestCase):
-    async def test_generate_async_deterministic(self):
+class LocalLLMTests(unittest.TestCase):
+    # One event loop for the whole class instead of IsolatedAsyncioTestCase's
+    # loop per test; each test still builds its own LocalLLM on that loop.
+    @classmethod
+    def setUpClass(cls):
+        cls._runner = asyncio.Runner()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._runner.close()
+
+    def test_generate_async_deterministic(self):
         cfg = LocalLLMConfig(tokens_per_second=0.0, ttfb_ms=0)
         llm = LocalLLM(cfg)
-        text = await llm.generate_async("Hello", max_tokens=5)
+        text = self._runner.run(llm.generate_async("Hello", max_tokens=5))
         self.assertEqual(text, "token_0 token_1 token_2 token_3 token_4")
 
-    async def test_stream_async_tokens_and_order(self):
+    def test_stream_async_tokens_and_order(self):
         cfg = LocalLLMConfig(tokens_per_second=0.0, ttfb_ms=0)
         llm = LocalLLM(cfg)
-        tokens = []
-        async for tok in llm.stream_async("Prompt", max_tokens=4):
-            tokens.append(tok)
+
+        async def collect():
+            return [tok async for tok in llm.stream_async("Prompt", max_tokens=4)]
+
+        tokens = self._runner.run(collect())
         self.assertEqual(tokens, ["token_0", "token_1", "token_2", "token_3"])
 
-    async def test_concurrency_cap(self):
-        # Use small TTFB and small per-token delay to ensure overlap
-        cfg = LocalLLMConfig(tokens_per_second=500.0, ttfb_ms=2, max_concurrency=5)
+    def test_concurrency_cap(self):
+        # One token with a ~1 ns delay: every request still suspends inside the
+        # semaphore (so holders overlap) without paying real TTFB/token latency
+        cfg = LocalLLMConfig(tokens_per_second=1e9, ttfb_ms=0, max_concurrency=5)
         llm = LocalLLM(cfg)
 
         async def worker(i: int):
-            # Make each request produce a handful of tokens
-            return await llm.generate_async(f"P{i}", max_tokens=3)
+            return await llm.generate_async(f"P{i}", max_tokens=1)
+
+        async def run_all():
+            # Launch twice as many tasks as the concurrency cap
+            return await asyncio.gather(*(worker(i) for i in range(2 * cfg.max_concurrency)))
 
-        # Launch more tasks than the concurrency cap
-        tasks = [asyncio.create_task(worker(i)) for i in range(10)]
-        await asyncio.gather(*tasks)
+        results = self._runner.run(run_all())
 
         # Peak concurrency should be capped at 5
         self.assertEqual(llm.peak_concurrency, 5)
         # Basic sanity: outputs are deterministic
-        self.assertTrue(all(t == "token_0 token_1 token_2" for t in [task.result() for task in tasks]))
+        self.assertTrue(all(r == "token_0" for r in results))
 
 
 if __name__ == "__main__":
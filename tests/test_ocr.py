@@ -2,8 +2,10 @@ import io
 import os
 import sys
 import json
+import functools
 import tempfile
 import unittest
+import contextlib
 
 # Ensure src is importable when running tests from repo root
 THIS_DIR = os.path.dirname(__file__)
@@ -11,6 +13,9 @@ SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
+# Prefer a memory-backed tmpfs for scratch files when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 from vision.ocr import LocalOCR  # noqa: E402
 from vision.cli_ocr import main as cli_main  # noqa: E402
 
@@ -22,27 +27,41 @@ def make_pgm_p5(width: int, height: int, pixels: bytes) -> bytes:
 
 def draw_rects(width: int, height: int, rects):
     # rects: list of (x,y,w,h,value)
-    img = bytearray([255] * (width * height))
+    img = bytearray(b"\xff" * (width * height))
     for (x, y, w, h, v) in rects:
-        for yy in range(y, y + h):
-            base = yy * width
-            for xx in range(x, x + w):
-                img[base + xx] = v
+        run = bytes((v,)) * w
+        for base in range(y * width + x, (y + h) * width + x, width):
+            img[base:base + w] = run
     return img
 
 
+@functools.lru_cache(maxsize=None)
+def _pgm_with_rects(width: int, height: int, rects: tuple) -> bytes:
+    # Fixture images are immutable bytes, so identical parameters share one
+    return make_pgm_p5(width, height, bytes(draw_rects(width, height, rects)))
+
+
 class OCRTests(unittest.TestCase):
-    def test_detect_multiple_regions(self):
-        w, h = 80, 60
-        rects = [
+    @classmethod
+    def setUpClass(cls):
+        # Stateless after construction; one instance serves every test
+        cls.ocr = LocalOCR()
+        # Synthesize the fixture images once per class
+        cls.pgm_two = _pgm_with_rects(80, 60, (
             (5, 5, 20, 15, 0),   # dark block 1
             (40, 30, 25, 20, 0), # dark block 2
-        ]
-        pixels = draw_rects(w, h, rects)
-        pgm = make_pgm_p5(w, h, bytes(pixels))
+        ))
+        cls.pgm_u = _pgm_with_rects(30, 30, (
+            # U-shape: two vertical bars joined only by the bottom bar
+            (5, 5, 4, 20, 0),    # left bar
+            (20, 5, 4, 20, 0),   # right bar
+            (5, 21, 19, 4, 0),   # bottom bar
+        ))
+        cls.pgm_blank = _pgm_with_rects(32, 32, ())
+        cls.pgm_cli = _pgm_with_rects(20, 20, ((2, 2, 6, 6, 0), (12, 10, 6, 8, 0)))
 
-        ocr = LocalOCR()
-        res = ocr.detect_and_read(pgm)
+    def test_detect_multiple_regions(self):
+        res = self.ocr.detect_and_read(self.pgm_two)
         self.assertIn("regions", res)
         regions = res["regions"]
         self.assertGreaterEqual(len(regions), 2)
@@ -64,31 +83,26 @@ class OCRTests(unittest.TestCase):
         self.assertTrue(close(got_bboxes[0], expected_bboxes[0]))
         self.assertTrue(close(got_bboxes[1], expected_bboxes[1]))
 
+    def test_concave_shape_is_single_region(self):
+        res = self.ocr.detect_and_read(self.pgm_u)
+        self.assertEqual(len(res["regions"]), 1)
+        self.assertEqual(res["regions"][0]["bbox"], [5, 5, 19, 20])
+
     def test_blank_image_returns_empty(self):
-        w, h = 32, 32
-        img = bytes([255] * (w * h))
-        pgm = make_pgm_p5(w, h, img)
-        ocr = LocalOCR()
-        res = ocr.detect_and_read(pgm)
+        res = self.ocr.detect_and_read(self.pgm_blank)
         self.assertEqual(res["regions"], [])
 
     def test_unsupported_format_raises(self):
-        ocr = LocalOCR()
         with self.assertRaises(ValueError):
-            ocr.detect_and_read(b"GIF89a\x00\x00\x00")
+            self.ocr.detect_and_read(b"GIF89a\x00\x00\x00")
 
     def test_cli_json_output(self):
-        w, h = 20, 20
-        rects = [ (2, 2, 6, 6, 0), (12, 10, 6, 8, 0) ]
-        pixels = draw_rects(w, h, rects)
-        pgm = make_pgm_p5(w, h, bytes(pixels))
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             img_path = os.path.join(td, "img.pgm")
             with open(img_path, "wb") as f:
-                f.write(pgm)
+                f.write(self.pgm_cli)
             buf = io.StringIO()
-            from unittest import mock
-            with mock.patch("sys.stdout", new=buf):
+            with contextlib.redirect_stdout(buf):
                 rc = cli_main(["--input", img_path, "--json"])  # call main() directly
             self.assertEqual(rc, 0)
             data = json.loads(buf.getvalue())
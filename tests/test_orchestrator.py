@@ -1,8 +1,9 @@
+import io
 import os
 import sys
-import time
 import json
 import unittest
+import contextlib
 
 # Ensure src is importable when running tests from repo root
 THIS_DIR = os.path.dirname(__file__)
@@ -11,7 +12,7 @@ if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
 from orchestrator.scheduler import Scheduler, Job, TaskSpec  # noqa: E402
-from orchestrator.cli_orch import main as cli_main  # noqa: E402
+from orchestrator.cli_orch import main as cli_main, run_actions  # noqa: E402
 
 
 class OrchestratorTests(unittest.TestCase):
@@ -65,7 +66,11 @@ class OrchestratorTests(unittest.TestCase):
         self.assertEqual(summary["jobs"]["Y"]["status"], "cancelled")
 
     def test_cli_json_output(self):
-        import io
+        summary = run_actions(["noop:hello", "sleep:0", "flaky:fail_until=1"], concurrency=3)
+        self.assertIn("jobs", summary)
+        self.assertIn("logs", summary)
+        self.assertGreaterEqual(summary.get("peak_concurrency", 0), 1)
+        # main() covers argv parsing and the printed JSON
         buf = io.StringIO()
         argv = [
             "--actions",
@@ -75,24 +80,84 @@ class OrchestratorTests(unittest.TestCase):
             "--concurrency", "3",
             "--json",
         ]
-        with unittest.mock.patch("sys.stdout", new=buf):
+        with contextlib.redirect_stdout(buf):
             rc = cli_main(argv)
         self.assertEqual(rc, 0)
         data = json.loads(buf.getvalue())
-        self.assertIn("jobs", data)
-        self.assertIn("logs", data)
-        self.assertGreaterEqual(data.get("peak_concurrency", 0), 1)
+        self.assertEqual(set(data["jobs"]), set(summary["jobs"]))
+        self.assertTrue(all(j["status"] == "succeeded" for j in data["jobs"].values()))
 
     def test_throughput_100_noops(self):
-        # Ensure we can schedule 100 noops quickly with concurrency=16
+        # 100 independent noops with concurrency=16: count dispatch work rather
+        # than timing it, so the check does not depend on host load
         jobs = [Job(id=f"N{i}", task=TaskSpec(type="noop", args={"value": i})) for i in range(100)]
-        sched = Scheduler(jobs, concurrency=16)
-        t0 = time.perf_counter()
+        sched = Scheduler(jobs, concurrency=16, clock=lambda: 0.0)
         summary = sched.run()
-        dt = time.perf_counter() - t0
         self.assertTrue(all(j["status"] == "succeeded" for j in summary["jobs"].values()))
-        # Be generous for CI but keep deterministic expectation (<2s on target machine)
-        self.assertLess(dt, 2.0)
+        self.assertEqual(summary["stats"], {"tasks_created": 0, "inline_jobs": 100})
+        self.assertEqual(summary["peak_concurrency"], 1)
+
+    def test_fast_noop_matches_task_path(self):
+        # Inline noop execution must give the same outcome as one task per job
+        def make_jobs():
+            A = Job(id="A", task=TaskSpec(type="noop", args={"value": "A"}))
+            B = Job(id="B", task=TaskSpec(type="sleep", args={"seconds": 0}), deps=["A"])
+            C = Job(id="C", task=TaskSpec(type="noop", args={"value": "C"}), deps=["B"])
+            D = Job(id="D", task=TaskSpec(type="fail"))
+            E = Job(id="E", task=TaskSpec(type="noop"), deps=["D"])
+            return [A, B, C, D, E]
+
+        def outcome(summary):
+            return {jid: (j["status"], j["attempts"], j["result"]) for jid, j in summary["jobs"].items()}
+
+        fast = Scheduler(make_jobs(), concurrency=2).run()
+        slow = Scheduler(make_jobs(), concurrency=2, fast_noop=False).run()
+        self.assertEqual(outcome(fast), outcome(slow))
+        self.assertEqual(fast["jobs"]["E"]["status"], "skipped")
+
+    def test_fast_noop_malformed_args_fails_job(self):
+        # A noop whose args is not a dict (plan JSON "args": null) fails like any task
+        def make_jobs():
+            A = Job(id="A", task=TaskSpec(type="noop", args=None))
+            B = Job(id="B", task=TaskSpec(type="noop"), deps=["A"])
+            C = Job(id="C", task=TaskSpec(type="noop", args=None, max_retries=1, backoff_base=0.0))
+            return [A, B, C]
+
+        def outcome(summary):
+            return {jid: (j["status"], j["attempts"], j["error"]) for jid, j in summary["jobs"].items()}
+
+        fast_sched = Scheduler(make_jobs(), concurrency=2)
+        fast = fast_sched.run()
+        slow = Scheduler(make_jobs(), concurrency=2, fast_noop=False).run()
+        self.assertEqual(outcome(fast), outcome(slow))
+        self.assertEqual(fast["jobs"]["A"]["status"], "failed")
+        self.assertTrue(fast["jobs"]["A"]["error"].startswith("AttributeError: "))
+        self.assertEqual(fast["jobs"]["B"]["status"], "skipped")
+        self.assertEqual(fast["jobs"]["C"]["attempts"], 2)
+        self.assertEqual(fast_sched._current_concurrency, 0)
+
+
+    def test_stop_on_error_cancels_ready_noops(self):
+        # A failing job next to ready noops: inline noops must not drain the queue
+        def make_jobs(failing):
+            jobs = [Job(id="F", task=failing)]
+            for i in range(6):
+                jobs.append(Job(id=f"N{i}", task=TaskSpec(type="noop")))
+                jobs.append(Job(id=f"C{i}", task=TaskSpec(type="noop"), deps=[f"N{i}"]))
+            return jobs
+
+        def statuses(summary):
+            return {jid: j["status"] for jid, j in summary["jobs"].items()}
+
+        fail_task = statuses(Scheduler(make_jobs(TaskSpec(type="fail")), concurrency=2, stop_on_error=True).run())
+        slow = statuses(Scheduler(make_jobs(TaskSpec(type="fail")), concurrency=2, stop_on_error=True, fast_noop=False).run())
+        self.assertEqual(fail_task, slow)
+        # Malformed inline noop ("args": null) fails and stops launching too
+        bad_noop = statuses(Scheduler(make_jobs(TaskSpec(type="noop", args=None)), concurrency=2, stop_on_error=True).run())
+        for result in (fail_task, bad_noop):
+            self.assertEqual(result["F"], "failed")
+            self.assertLessEqual(list(result.values()).count("succeeded"), 1)
+            self.assertGreaterEqual(list(result.values()).count("cancelled"), 11)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import io
 import os
 import sys
 import json
+import hmac
 import unittest
 import contextlib
 
@@ -12,41 +13,39 @@ if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
 from security.crypto import AES256CBC, pbkdf2_sha256, encrypt_with_password, decrypt_with_password, DPAPIProtector  # noqa: E402
-from security.cli_crypto import main as cli_main  # noqa: E402
+from security.cli_crypto import main as cli_main, build_parser as cli_parser, _run as cli_run  # noqa: E402
+
+# NIST SP 800-38A F.2.5 CBC-AES256, decoded once at import
+NIST_CBC_KEY = bytes.fromhex(
+    "603deb1015ca71be2b73aef0857d7781"
+    "1f352c073b6108d72d9810a30914dff4"
+)
+NIST_CBC_IV = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+NIST_CBC_PT = bytes.fromhex(
+    "6bc1bee22e409f96e93d7e117393172a"
+    "ae2d8a571e03ac9c9eb76fac45af8e51"
+    "30c81c46a35ce411e5fbc1191a0a52ef"
+    "f69f2445df4f9b17ad2b417be66c3710"
+)
+NIST_CBC_CT = bytes.fromhex(
+    "f58c4c04d6e5f1ba779eabfb5f7bfbd6"
+    "9cfc4e967edb808d679f777bc6702c7d"
+    "39f23369a9d9bacfa530e26304231461"
+    "b2eb05e2c39be9fcda6c19078c6a9d1b"
+)
 
 
 class SecurityTests(unittest.TestCase):
     def test_aes256_cbc_nist_vectors(self):
-        # NIST SP 800-38A F.2.5 CBC-AES256
-        key_hex = (
-            "603deb1015ca71be2b73aef0857d7781"
-            "1f352c073b6108d72d9810a30914dff4"
-        )
-        iv_hex = "000102030405060708090a0b0c0d0e0f"
-        pt_hex = (
-            "6bc1bee22e409f96e93d7e117393172a"
-            "ae2d8a571e03ac9c9eb76fac45af8e51"
-            "30c81c46a35ce411e5fbc1191a0a52ef"
-            "f69f2445df4f9b17ad2b417be66c3710"
-        )
-        ct_expected_hex = (
-            "f58c4c04d6e5f1ba779eabfb5f7bfbd6"
-            "9cfc4e967edb808d679f777bc6702c7d"
-            "39f23369a9d9bacfa530e26304231461"
-            "b2eb05e2c39be9fcda6c19078c6a9d1b"
-        )
-        key = bytes.fromhex(key_hex)
-        iv = bytes.fromhex(iv_hex)
-        pt = bytes.fromhex(pt_hex)
-        ct_expected = bytes.fromhex(ct_expected_hex)
-
+        key, iv, pt, ct_expected = NIST_CBC_KEY, NIST_CBC_IV, NIST_CBC_PT, NIST_CBC_CT
         aes = AES256CBC(key)
         # Manual CBC without padding
         ct_out = bytearray()
         prev = iv
         for i in range(0, len(pt), 16):
             block = pt[i:i+16]
-            x = bytes(a ^ b for a, b in zip(block, prev))
+            # 128-bit XOR as one integer op instead of 16 byte ops
+            x = (int.from_bytes(block, "big") ^ int.from_bytes(prev, "big")).to_bytes(16, "big")
             enc = aes.encrypt_block(x)
             ct_out.extend(enc)
             prev = enc
@@ -58,10 +57,29 @@ class SecurityTests(unittest.TestCase):
         for i in range(0, len(ct_expected), 16):
             block = ct_expected[i:i+16]
             dec = aes.decrypt_block(block)
-            out.extend(bytes(a ^ b for a, b in zip(dec, prev)))
+            out.extend((int.from_bytes(dec, "big") ^ int.from_bytes(prev, "big")).to_bytes(16, "big"))
             prev = block
         self.assertEqual(bytes(out), pt)
 
+    def test_aes256_cbc_batch_nist(self):
+        # Same vectors through the library CBC path with padding off
+        aes = AES256CBC(NIST_CBC_KEY)
+        self.assertEqual(aes.encrypt_cbc(NIST_CBC_IV, NIST_CBC_PT, pad=False), NIST_CBC_CT)
+        self.assertEqual(aes.decrypt_cbc(NIST_CBC_IV, NIST_CBC_CT, pad=False), NIST_CBC_PT)
+        with self.assertRaises(ValueError):
+            aes.encrypt_cbc(NIST_CBC_IV, NIST_CBC_PT[:-1], pad=False)
+
+    def test_aes256_block_matches_reference_rounds(self):
+        # T-table block functions vs the step-by-step FIPS-197 rounds
+        aes = AES256CBC(bytes(range(32)))
+        block = bytes.fromhex("00112233445566778899aabbccddeeff")
+        # FIPS-197 Appendix C.3
+        self.assertEqual(aes.encrypt_block(block).hex(), "8ea2b7ca516745bfeafc49904b496089")
+        for i in range(64):
+            b = bytes((i * 37 + j * 11) & 0xFF for j in range(16))
+            self.assertEqual(aes.encrypt_block(b), aes._encrypt_block_ref(b))
+            self.assertEqual(aes.decrypt_block(b), aes._decrypt_block_ref(b))
+
     def test_pbkdf2_and_password_roundtrip(self):
         password = "pass"
         salt = bytes.fromhex("00112233aabbccdd00112233aabbccdd")
@@ -78,9 +96,25 @@ class SecurityTests(unittest.TestCase):
         pt2 = decrypt_with_password(ct, password, salt, iv, iterations=iterations)
         self.assertEqual(pt2, plaintext)
 
+    def test_pbkdf2_large_dklen(self):
+        # 480-byte key = 15 SHA-256 output blocks; check against a per-block
+        # RFC 8018 construction (T_i = U_1 ^ ... ^ U_c, U_1 = PRF(P, S || INT(i)))
+        password, salt, iterations = b"pass", b"salt" * 4, 3
+        dk = pbkdf2_sha256(password, salt, iterations, 480)
+        self.assertEqual(len(dk), 480)
+        ref = b""
+        for i in range(1, 16):
+            u = hmac.new(password, salt + i.to_bytes(4, "big"), "sha256").digest()
+            t = int.from_bytes(u, "big")
+            for _ in range(iterations - 1):
+                u = hmac.new(password, u, "sha256").digest()
+                t ^= int.from_bytes(u, "big")
+            ref += t.to_bytes(32, "big")
+        self.assertEqual(dk, ref)
+        self.assertEqual(dk[:32], pbkdf2_sha256(password, salt, iterations, 32))
+
+    @unittest.skipUnless(sys.platform == "win32", "DPAPI only on Windows")
     def test_dpapi_roundtrip_windows_only(self):
-        if sys.platform != "win32":
-            self.skipTest("DPAPI only on Windows")
         dp = DPAPIProtector()
         secret = b"secret-bytes"
         blob = dp.protect(secret)
@@ -88,48 +122,36 @@ class SecurityTests(unittest.TestCase):
         back = dp.unprotect(blob)
         self.assertEqual(back, secret)
 
-    def test_cli_aes_and_dpapi(self):
-        # AES CLI
-        buf = io.StringIO()
+    def test_cli_aes(self):
+        # AES CLI: _run returns the result dict that main() prints as JSON
         password = "pass"
         salt_hex = "00112233AABBCCDD00112233AABBCCDD"
         iv_hex = "000102030405060708090A0B0C0D0E0F"
-        with contextlib.redirect_stdout(buf):
-            rc = cli_main([
-                "--mode", "aes", "--op", "encrypt", "--password", password,
-                "--salt", salt_hex, "--iv", iv_hex, "--in", "hello", "--json",
-            ])
-        self.assertEqual(rc, 0)
-        out = json.loads(buf.getvalue())
+        out = cli_run(cli_parser().parse_args([
+            "--mode", "aes", "--op", "encrypt", "--password", password,
+            "--salt", salt_hex, "--iv", iv_hex, "--in", "hello", "--json",
+        ]))
         self.assertIn("ciphertext", out)
         ct_hex = out["ciphertext"]
-        # Decrypt
-        buf2 = io.StringIO()
-        with contextlib.redirect_stdout(buf2):
+        # Decrypt through main() to cover the printed JSON
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
             rc = cli_main([
                 "--mode", "aes", "--op", "decrypt", "--password", password,
                 "--salt", salt_hex, "--iv", iv_hex, "--in_hex", ct_hex, "--json",
             ])
         self.assertEqual(rc, 0)
-        out2 = json.loads(buf2.getvalue())
+        out2 = json.loads(buf.getvalue())
         self.assertEqual(out2.get("plaintext"), "hello")
 
-        # DPAPI CLI (Windows-only)
-        if sys.platform == "win32":
-            buf3 = io.StringIO()
-            with contextlib.redirect_stdout(buf3):
-                rc = cli_main(["--mode", "dpapi", "--op", "encrypt", "--in", "secret", "--json"]) 
-            self.assertEqual(rc, 0)
-            out3 = json.loads(buf3.getvalue())
-            self.assertIn("blob", out3)
-            blob_hex = out3["blob"]
-
-            buf4 = io.StringIO()
-            with contextlib.redirect_stdout(buf4):
-                rc = cli_main(["--mode", "dpapi", "--op", "decrypt", "--in_hex", blob_hex, "--json"]) 
-            self.assertEqual(rc, 0)
-            out4 = json.loads(buf4.getvalue())
-            self.assertEqual(out4.get("plaintext"), "secret")
+    @unittest.skipUnless(sys.platform == "win32", "DPAPI only on Windows")
+    def test_cli_dpapi(self):
+        out = cli_run(cli_parser().parse_args(["--mode", "dpapi", "--op", "encrypt", "--in", "secret", "--json"]))
+        self.assertIn("blob", out)
+        blob_hex = out["blob"]
+
+        out2 = cli_run(cli_parser().parse_args(["--mode", "dpapi", "--op", "decrypt", "--in_hex", blob_hex, "--json"]))
+        self.assertEqual(out2.get("plaintext"), "secret")
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import struct
 import tempfile
 import unittest
 import json
+import contextlib
 
 # Ensure src is importable when running tests from repo root
 THIS_DIR = os.path.dirname(__file__)
@@ -13,8 +14,11 @@ SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
+# Prefer a memory-backed tmpfs for scratch files when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 from audio.tts import LocalTTS  # noqa: E402
-from audio.cli_tts import main as tts_cli_main  # noqa: E402
+from audio.cli_tts import main as tts_cli_main, build_parser as tts_cli_parser, _run as tts_cli_run  # noqa: E402
 
 
 class TTSTests(unittest.TestCase):
@@ -54,7 +58,7 @@ class TTSTests(unittest.TestCase):
     def test_save_wav_and_read_back(self):
         tts = LocalTTS()
         sr = 16000
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             out = os.path.join(td, "out.wav")
             res = tts.save_wav(out, "test", sample_rate=sr)
             self.assertTrue(os.path.exists(out))
@@ -66,20 +70,17 @@ class TTSTests(unittest.TestCase):
                 self.assertEqual(wf.getnframes(), len(res.pcm16) // 2)
 
     def test_cli_json_no_output(self):
-        buf = io.StringIO()
-        with unittest.mock.patch("sys.stdout", new=buf):
-            rc = tts_cli_main(["--text", "abc", "--json"])  # call main() directly
-        self.assertEqual(rc, 0)
-        data = json.loads(buf.getvalue())
+        # _run returns the metadata dict that main() prints as JSON
+        data = tts_cli_run(tts_cli_parser().parse_args(["--text", "abc", "--json"]))
         self.assertIn("duration_s", data)
         self.assertIn("sample_rate", data)
         self.assertIn("bytes", data)
 
     def test_cli_json_with_output_path(self):
-        with tempfile.TemporaryDirectory() as td:
+        with tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True) as td:
             out = os.path.join(td, "say.wav")
             buf = io.StringIO()
-            with unittest.mock.patch("sys.stdout", new=buf):
+            with contextlib.redirect_stdout(buf):
                 rc = tts_cli_main(["--text", "abc", "--output", out, "--json"])  # call main() directly
             self.assertEqual(rc, 0)
             data = json.loads(buf.getvalue())
@@ -1,7 +1,8 @@
 import io
-import json
 import os
 import sys
+import json
+import contextlib
 import tempfile
 import unittest
 
@@ -11,8 +12,11 @@ SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
-from web.automation import Browser  # noqa: E402
-from web.cli_web import main as cli_main  # noqa: E402
+# Prefer a memory-backed tmpfs for scratch files when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+from web.automation import Browser, SelectorEngine  # noqa: E402
+from web.cli_web import main as cli_main, _build_parser as cli_parser, _run as cli_run  # noqa: E402
 
 
 _HTML = """
@@ -30,6 +34,24 @@ _HTML = """
 
 
 class WebAutomationTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Pages are independent; one Browser (one of the three slots) serves all
+        cls._browser = Browser()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._browser.close()
+
+    def setUp(self):
+        self.page = self._browser.new_page()
+        self.page.goto_html(_HTML)
+
+    def _tmpdir(self) -> str:
+        td = tempfile.TemporaryDirectory(dir=_TMPDIR, ignore_cleanup_errors=True)
+        self.addCleanup(td.cleanup)
+        return td.name
+
     def _write_html(self, dirpath: str, name: str = "page.html") -> str:
         path = os.path.join(dirpath, name)
         with open(path, "w", encoding="utf-8") as f:
@@ -37,101 +59,101 @@ class WebAutomationTests(unittest.TestCase):
         return path
 
     def test_dom_and_selectors(self):
-        with tempfile.TemporaryDirectory() as td:
-            html_path = self._write_html(td)
-            br = Browser()
-            try:
-                page = br.new_page()
-                page.goto(html_path)
-                self.assertEqual(page.locator("#login").count(), 1)
-                self.assertEqual(page.locator(".btn").count(), 1)
-                self.assertEqual(page.locator("button").count(), 1)
-                self.assertEqual(page.locator("div .text span").count(), 1)
-                self.assertEqual(page.locator(".text").first().get_text(), "Hello World")
-            finally:
-                br.close()
+        self.assertEqual(self.page.locator("#login").count(), 1)
+        self.assertEqual(self.page.locator(".btn").count(), 1)
+        self.assertEqual(self.page.locator("button").count(), 1)
+        self.assertEqual(self.page.locator("div .text span").count(), 1)
+        self.assertEqual(self.page.locator(".text").first().get_text(), "Hello World")
+
+    def test_index_tracks_fill(self):
+        self.assertEqual(self.page.locator("span").count(), 2)
+        self.assertEqual(self.page.locator("document #copy").count(), 1)
+        # Replacing the footer's children drops #copy from the page
+        self.page.locator(".footer").fill("gone")
+        self.assertEqual(self.page.locator("span").count(), 1)
+        self.assertEqual(self.page.locator("#copy").count(), 0)
+
+    def test_tree_walk_matches_index(self):
+        # The tree walk behind SelectorEngine.query_all must agree with the
+        # index that locators answer from, including quoted values
+        self.page.goto_html('<div id="a\'b" class="x\\y"><p class="q">t</p></div>' + _HTML)
+        for sel in ("#a'b", ".x\\y", "div .q", "div span", "#container .text span", "#missing"):
+            walked = SelectorEngine.query_all(self.page._root, sel)
+            self.assertEqual(walked, self.page.locator(sel)._nodes(), sel)
+        self.assertEqual(len(SelectorEngine.query_all(self.page._root, "#a'b .q")), 1)
 
     def test_click_and_fill_semantics(self):
-        with tempfile.TemporaryDirectory() as td:
-            html_path = self._write_html(td)
-            br = Browser()
-            try:
-                page = br.new_page()
-                page.goto(html_path)
-                page.locator("#login").click()
-                self.assertEqual(page.locator("#login").first().get_attribute("data-clicked"), "true")
-                page.locator("#user").fill("alice")
-                self.assertEqual(page.locator("#user").first().get_attribute("value"), "alice")
-                page.locator(".text").fill("Replaced")
-                self.assertEqual(page.locator(".text").get_text(), "Replaced")
-            finally:
-                br.close()
+        self.page.locator("#login").click()
+        self.assertEqual(self.page.locator("#login").first().get_attribute("data-clicked"), "true")
+        self.page.locator("#user").fill("alice")
+        self.assertEqual(self.page.locator("#user").first().get_attribute("value"), "alice")
+        self.page.locator(".text").fill("Replaced")
+        self.assertEqual(self.page.locator(".text").get_text(), "Replaced")
 
     def test_wait_for_selector_and_timeout(self):
-        with tempfile.TemporaryDirectory() as td:
-            html_path = self._write_html(td)
-            br = Browser()
-            try:
-                page = br.new_page()
-                page.goto(html_path)
-                loc = page.wait_for_selector("#login", timeout_ms=10)
-                self.assertIsNotNone(loc)
-                with self.assertRaises(TimeoutError):
-                    page.wait_for_selector("#missing", timeout_ms=10)
-            finally:
-                br.close()
+        loc = self.page.wait_for_selector("#login", timeout_ms=10)
+        self.assertIsNotNone(loc)
+        with self.assertRaises(TimeoutError):
+            self.page.wait_for_selector("#missing", timeout_ms=10)
 
     def test_screenshot_writes_bmp(self):
-        with tempfile.TemporaryDirectory() as td:
-            html_path = self._write_html(td)
-            bmp_path = os.path.join(td, "shot.bmp")
-            br = Browser()
-            try:
-                page = br.new_page()
-                page.goto(html_path)
-                page.screenshot(bmp_path)
-            finally:
-                br.close()
-            with open(bmp_path, "rb") as f:
-                data = f.read()
-            self.assertGreater(len(data), 54)
-            self.assertEqual(data[:2], b"BM")
+        # Loads from a file to keep goto()'s path handling covered
+        td = self._tmpdir()
+        html_path = self._write_html(td)
+        bmp_path = os.path.join(td, "shot.bmp")
+        page = self._browser.new_page()
+        page.goto(html_path)
+        page.screenshot(bmp_path)
+        with open(bmp_path, "rb") as f:
+            data = f.read()
+        self.assertGreater(len(data), 54)
+        self.assertEqual(data[:2], b"BM")
+
+    def test_cli_json_and_image(self):
+        td = self._tmpdir()
+        html_path = self._write_html(td)
+        bmp_path = os.path.join(td, "out.bmp")
+        argv = [
+            "--html", html_path,
+            "--actions",
+            "click=#login",
+            "fill=#user:alice",
+            "get_text=.text",
+            f"screenshot={bmp_path}",
+            "--json",
+        ]
+        # _run returns the dict that main() prints as JSON
+        data = cli_run(cli_parser().parse_args(argv))
+        self.assertIn("results", data)
+        self.assertTrue(any(r.get("action") == "get_text" for r in data["results"]))
+        self.assertTrue(os.path.exists(bmp_path))
+        with open(bmp_path, "rb") as f:
+            self.assertEqual(f.read(2), b"BM")
+        # main() covers argv handling and the printed JSON
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            rc = cli_main(argv)
+        self.assertEqual(rc, 0)
+        self.assertEqual(json.loads(buf.getvalue()), data)
+
+
+class BrowserLimitTests(unittest.TestCase):
+    # Kept apart from the shared Browser above, which would hold one of the slots
+    def _browser(self) -> Browser:
+        # close() is idempotent, so cleanup is safe after an explicit close
+        br = Browser()
+        self.addCleanup(br.close)
+        return br
 
     def test_concurrency_limit(self):
-        b1 = Browser()
-        b2 = Browser()
-        b3 = Browser()
+        self._browser()
+        b2 = self._browser()
+        self._browser()
         with self.assertRaises(RuntimeError):
             Browser()
         # Free a slot
         b2.close()
-        b4 = Browser()
-        # Clean up
-        b1.close(); b3.close(); b4.close()
-
-    def test_cli_json_and_image(self):
-        with tempfile.TemporaryDirectory() as td:
-            html_path = self._write_html(td)
-            bmp_path = os.path.join(td, "out.bmp")
-            buf = io.StringIO()
-            argv = [
-                "--html", html_path,
-                "--actions",
-                "click=#login",
-                "fill=#user:alice",
-                "get_text=.text",
-                f"screenshot={bmp_path}",
-                "--json",
-            ]
-            with unittest.mock.patch("sys.stdout", new=buf):
-                rc = cli_main(argv)
-            self.assertEqual(rc, 0)
-            data = json.loads(buf.getvalue())
-            self.assertIn("results", data)
-            self.assertTrue(any(r.get("action") == "get_text" for r in data["results"]))
-            self.assertTrue(os.path.exists(bmp_path))
-            with open(bmp_path, "rb") as f:
-                self.assertEqual(f.read(2), b"BM")
+        self._browser()
 
 
 if __name__ == "__main__":